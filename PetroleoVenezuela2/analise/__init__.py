@@ -0,0 +1,11 @@
+"""Modelos de engenharia de reservatórios (DCA), curvas-tipo e análise preditiva."""
+from exportacao_tardia import exportar_sob_demanda
+
+_EXPORTS = {
+    'DeclineCurveAnalyzer': 'engenharia_reservatorios',
+    'AnaliseDeclinio': 'modelo_preditivo',
+    'BibliotecaAnalogos': 'curvas_tipo',
+    'normalizar_historicos': 'curvas_tipo',
+}
+
+__getattr__, __dir__, __all__ = exportar_sob_demanda(__name__, _EXPORTS)
@@ -0,0 +1,166 @@
+import numpy as np
+
+
+def normalizar_historicos(df_prod, ajustes, coluna_id='poco', n_meses=12):
+    """
+    Converte históricos de produção em curvas normalizadas (q/qi x meses).
+    Usa o qi ajustado por Arps de cada poço; poços sem ajuste válido ou com
+    menos de n_meses de histórico são descartados.
+
+    Retorna (ids, curvas (n_pocos, n_meses), di, b).
+    """
+    validos = {poco: p for poco, p in ajustes.items() if p.get('success') and p['qi'] > 0}
+    df = df_prod[df_prod[coluna_id].isin(validos.keys())].sort_values([coluna_id, 'data'])
+
+    # Índice do mês dentro de cada poço, para montar a matriz sem laço por poço
+    mes = df.groupby(coluna_id, sort=False).cumcount().values
+    df = df[mes < n_meses]
+    mes = mes[mes < n_meses]
+
+    ids, linha = np.unique(df[coluna_id].values, return_inverse=True)
+    curvas = np.full((len(ids), n_meses), np.nan, dtype=np.float32)
+    curvas[linha, mes] = df['producao_bpd'].values
+
+    completos = ~np.isnan(curvas).any(axis=1)
+    ids, curvas = ids[completos], curvas[completos]
+
+    qi = np.array([validos[p]['qi'] for p in ids], dtype=np.float32)
+    di = np.array([validos[p]['di_mensal'] for p in ids], dtype=np.float32)
+    b = np.array([validos[p]['b'] for p in ids], dtype=np.float32)
+    return ids, curvas / qi[:, None], di, b
+
+
+class BibliotecaAnalogos:
+    """
+    Biblioteca de poços históricos para previsão por analogia.
+
+    Cada poço vira um vetor compacto de características: log(di), b e as vazões
+    normalizadas (q/qi) em alguns meses após o início (t=0 fica de fora: q/qi
+    vale ~1 em todos os poços e só carregaria ruído para a distância). Os vetores são padronizados,
+    agrupados em curvas-tipo (K-Means) e indexados em uma KD-tree, de modo que
+    os k análogos de um poço novo são encontrados em tempo sub-milissegundo
+    mesmo com milhões de poços na biblioteca.
+    """
+
+    def __init__(self, meses_amostra=(3, 6, 12), n_curvas_tipo=8):
+        self.meses_amostra = tuple(meses_amostra)
+        self.n_curvas_tipo = n_curvas_tipo
+        self.ids = None
+        self.arvore = None
+
+    def _caracteristicas(self, curvas, di, b):
+        curvas = np.atleast_2d(np.asarray(curvas, dtype=np.float32))
+        colunas = [np.log(np.maximum(np.atleast_1d(di).astype(np.float32), 1e-6)),
+                   np.atleast_1d(b).astype(np.float32)]
+        # Mês m é a coluna m (t=0 é o primeiro mês do histórico)
+        colunas += [curvas[:, m] for m in self.meses_amostra]
+        return np.column_stack(colunas)
+
+    def construir(self, ids, curvas, di, b):
+        """
+        Constrói a biblioteca a partir de curvas normalizadas (n_pocos, n_meses)
+        e dos parâmetros de Arps de cada poço.
+        """
+        from scipy.spatial import cKDTree
+        from sklearn.cluster import MiniBatchKMeans
+
+        curvas = np.asarray(curvas, dtype=np.float32)
+        if len(curvas) == 0:
+            raise ValueError("Nenhum poço válido para construir a biblioteca.")
+        if curvas.shape[1] <= max(self.meses_amostra):
+            raise ValueError(f"As curvas precisam de pelo menos {max(self.meses_amostra) + 1} meses.")
+
+        self.ids = np.asarray(ids)
+        self.di = np.asarray(di, dtype=np.float32)
+        self.b = np.asarray(b, dtype=np.float32)
+
+        caracteristicas = self._caracteristicas(curvas, self.di, self.b)
+        self.media = caracteristicas.mean(axis=0)
+        self.desvio = caracteristicas.std(axis=0)
+        self.desvio[self.desvio == 0] = 1.0
+        padronizadas = (caracteristicas - self.media) / self.desvio
+
+        # Curvas-tipo: agrupamento das formas de declínio (no máximo um grupo por poço)
+        kmeans = MiniBatchKMeans(n_clusters=min(self.n_curvas_tipo, len(curvas)), batch_size=4096, n_init=3,
+                                 random_state=42)
+        self.rotulos = kmeans.fit_predict(padronizadas).astype(np.int16)
+        self.centros = kmeans.cluster_centers_
+
+        # Curva-tipo = mediana das curvas normalizadas de cada grupo, com faixa P90/P10
+        # na convenção de excedência: P90 (conservador) é o percentil 10, P10 o percentil 90
+        self.curvas_tipo = {}
+        ordem = np.argsort(self.rotulos, kind='stable')
+        cortes = np.flatnonzero(np.diff(self.rotulos[ordem])) + 1
+        for grupo in np.split(ordem, cortes):
+            rotulo = int(self.rotulos[grupo[0]])
+            p90, p50, p10 = np.percentile(curvas[grupo], [10, 50, 90], axis=0)
+            self.curvas_tipo[rotulo] = {'p10': p10, 'p50': p50, 'p90': p90, 'n_pocos': len(grupo)}
+
+        # balanced_tree=False acelera bastante a construção com milhões de pontos
+        self.arvore = cKDTree(padronizadas, leafsize=32, balanced_tree=False, compact_nodes=False)
+        return self
+
+    @classmethod
+    def do_historico(cls, df_prod, ajustes, coluna_id='poco', n_meses=12, **kwargs):
+        """
+        Constrói a biblioteca diretamente de um DataFrame de produção e dos ajustes DCA.
+        """
+        biblioteca = cls(**kwargs)
+        ids, curvas, di, b = normalizar_historicos(df_prod, ajustes, coluna_id=coluna_id,
+                                                   n_meses=max(n_meses, max(biblioteca.meses_amostra) + 1))
+        return biblioteca.construir(ids, curvas, di, b)
+
+    def _padronizar(self, curvas, di, b):
+        if self.arvore is None:
+            raise ValueError("Biblioteca vazia. Execute construir primeiro.")
+        return (self._caracteristicas(curvas, di, b) - self.media) / self.desvio
+
+    def _consultar(self, x, k, workers=1):
+        # k maior que a biblioteca faria a KD-tree completar com índice n e distância infinita
+        k = min(k, len(self.ids))
+        distancias, indices = self.arvore.query(x, k=k, workers=workers)
+        return distancias, indices, k
+
+    def buscar_analogos(self, curva_normalizada, di, b, k=10):
+        """
+        Retorna os k poços mais parecidos com o poço consultado (todos, se a
+        biblioteca tiver menos de k): lista de dicionários com id, distância
+        e curva-tipo do análogo.
+        """
+        distancias, indices, _ = self._consultar(self._padronizar(curva_normalizada, di, b)[0], k)
+        distancias, indices = np.atleast_1d(distancias), np.atleast_1d(indices)
+        return [
+            {'id': self.ids[i], 'distancia': float(d), 'curva_tipo': int(self.rotulos[i])}
+            for d, i in zip(distancias, indices)
+        ]
+
+    def buscar_analogos_lote(self, curvas_normalizadas, di, b, k=10, workers=-1):
+        """
+        Consulta vetorizada para vários poços; retorna (distâncias, índices)
+        (n_consultas, min(k, tamanho da biblioteca)).
+        """
+        distancias, indices, k = self._consultar(self._padronizar(curvas_normalizadas, di, b), k, workers)
+        return distancias.reshape(-1, k), indices.reshape(-1, k)
+
+    def classificar(self, curva_normalizada, di, b):
+        """
+        Retorna o rótulo da curva-tipo mais próxima do poço consultado.
+        """
+        x = self._padronizar(curva_normalizada, di, b)[0]
+        return int(np.argmin(((self.centros - x) ** 2).sum(axis=1)))
+
+    def prever_por_analogia(self, qi, curva_normalizada, di, b, k=10, meses=120):
+        """
+        Previsão de um poço novo: mediana das curvas de Arps normalizadas dos
+        k análogos, escalada pelo qi do poço. Retorna (p90, p50, p10) em bbl/dia,
+        do cenário conservador ao otimista (convenção de excedência: P90 é
+        superado por 90% dos análogos).
+        """
+        from analise.engenharia_reservatorios import DeclineCurveAnalyzer
+
+        _, indices, _ = self._consultar(self._padronizar(curva_normalizada, di, b)[0], k)
+        indices = np.atleast_1d(indices)
+        curvas = DeclineCurveAnalyzer.arps_vetorizado(np.arange(meses), np.ones(len(indices)),
+                                                      self.di[indices], self.b[indices])
+        p90, p50, p10 = np.percentile(curvas, [10, 50, 90], axis=0)
+        return qi * p90, qi * p50, qi * p10
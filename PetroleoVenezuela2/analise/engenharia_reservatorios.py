@@ -1,7 +1,4 @@
 import numpy as np
-import pandas as pd
-from scipy.optimize import curve_fit
-from sklearn.metrics import r2_score
 
 class DeclineCurveAnalyzer:
     """
@@ -26,11 +23,79 @@ class DeclineCurveAnalyzer:
         else:
             return qi / ((1 + b * di * t)**(1/b))
 
+    @staticmethod
+    def arps_vetorizado(t, qi, di, b):
+        """
+        Equação de Arps para vários poços de uma vez.
+        qi, di, b: arrays (n_pocos,); t: array (n_meses,) comum a todos os poços
+        ou matriz (n_pocos, n_meses) com os tempos de cada poço.
+        Retorna matriz (n_pocos, n_meses) de vazões.
+        """
+        qi = np.asarray(qi, dtype=float)[:, None]
+        di = np.asarray(di, dtype=float)[:, None]
+        b = np.asarray(b, dtype=float)[:, None]
+        t = np.asarray(t, dtype=float)
+        if t.ndim == 1:
+            t = t[None, :]
+
+        exponencial = np.abs(b) < 1e-4
+        b_seguro = np.where(exponencial, 1.0, b)
+        with np.errstate(over='ignore', invalid='ignore'):
+            q_hiper = qi / (1 + b_seguro * di * t) ** (1 / b_seguro)
+        q = np.where(exponencial, qi * np.exp(-di * t), q_hiper)
+        return np.where(di <= 0, qi, q)
+
+    @staticmethod
+    def calcular_eur(qi, di, b, q_limite=50.0, horizonte_meses=600):
+        """
+        Recuperação final estimada (EUR, em barris) pela integral analítica de Arps,
+        até a vazão cair ao limite econômico q_limite (bbl/dia) ou até o horizonte.
+        Aceita escalares ou arrays (um valor por poço).
+        """
+        qi = np.asarray(qi, dtype=float)
+        di = np.maximum(np.asarray(di, dtype=float), 1e-12)
+        b = np.asarray(b, dtype=float)
+        dias_por_mes = 365.25 / 12
+
+        exponencial = np.abs(b) < 1e-4
+        harmonico = np.abs(b - 1) < 1e-4
+        b_seguro = np.where(exponencial | harmonico, 0.5, b)
+        razao = np.maximum(qi / q_limite, 1.0)
+
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            # Tempo (meses) até atingir o limite econômico
+            b_nao_nulo = np.where(exponencial, 1.0, b)
+            t_limite = np.where(exponencial, np.log(razao) / di, (razao ** b_nao_nulo - 1) / (b_nao_nulo * di))
+            t_fim = np.minimum(t_limite, horizonte_meses)
+
+            np_exp = qi / di * (1 - np.exp(-di * t_fim))
+            np_harm = qi / di * np.log1p(di * t_fim)
+            np_hiper = qi / ((1 - b_seguro) * di) * (1 - (1 + b_seguro * di * t_fim) ** ((b_seguro - 1) / b_seguro))
+
+        acumulado = np.where(exponencial, np_exp, np.where(harmonico, np_harm, np_hiper))
+        return acumulado * dias_por_mes
+
+    @staticmethod
+    def coeficiente_r2(y_real, y_pred):
+        """
+        Coeficiente de determinação (R²), equivalente a sklearn.metrics.r2_score
+        para séries 1D, sem o custo de importar o scikit-learn.
+        """
+        y_real = np.asarray(y_real, dtype=float)
+        ss_res = np.sum((y_real - y_pred) ** 2)
+        ss_tot = np.sum((y_real - y_real.mean()) ** 2)
+        if ss_tot == 0:
+            return 1.0 if ss_res == 0 else 0.0
+        return 1.0 - ss_res / ss_tot
+
     def fit_decline_curve(self, datas, producao):
         """
         Ajusta a curva de declínio aos dados de produção.
         Retorna parâmetros ótimos (qi, di, b) e métricas de ajuste.
         """
+        # Importação pesada adiada até o primeiro ajuste (inicialização rápida)
+        from scipy.optimize import curve_fit
+
         # Normalizar tempo (t=0 no início do histórico fornecido)
         t = np.arange(len(producao))
         
@@ -45,7 +110,7 @@ class DeclineCurveAnalyzer:
             
             # Calcular R2
             y_pred = self.arps_equation(t, *popt)
-            r2 = r2_score(producao, y_pred)
+            r2 = self.coeficiente_r2(producao, y_pred)
             
             return {
                 'qi': qi_fit,
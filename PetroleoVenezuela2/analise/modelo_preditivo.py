@@ -1,6 +1,6 @@
 import numpy as np
-from scipy.optimize import curve_fit
-from sklearn.metrics import r2_score
+
+from analise.engenharia_reservatorios import DeclineCurveAnalyzer
 
 class AnaliseDeclinio:
     """
@@ -40,6 +40,9 @@ class AnaliseDeclinio:
         tempos: array de dias/meses (numérico)
         producoes: array de taxas de produção
         """
+        # Importação pesada adiada até o primeiro ajuste (inicialização rápida)
+        from scipy.optimize import curve_fit
+
         # Limites para os parâmetros: qi > 0, di > 0, 0 <= b <= 1
         bounds = ((0, 0, 0), (np.inf, np.inf, 1.0))
         
@@ -84,7 +87,7 @@ class AnaliseDeclinio:
         Calcula R² para validação.
         """
         predicoes = self.prever_producao(tempos)
-        return r2_score(producoes_reais, predicoes)
+        return DeclineCurveAnalyzer.coeficiente_r2(producoes_reais, predicoes)
 
     def obter_parametros(self):
         if self.params is None:
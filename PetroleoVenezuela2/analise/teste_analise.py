@@ -1,6 +1,5 @@
 import sys
 import os
-import matplotlib.pyplot as plt
 import pandas as pd
 import numpy as np
 
@@ -9,6 +8,38 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from dados.ingestao import OpecDataLoader
 from analise.engenharia_reservatorios import DeclineCurveAnalyzer
 
+def plotar_resultado_dca(campo, datas, y_prod, resultados, previsao, output_file):
+    """
+    Plota histórico, ajuste DCA e previsão de um campo e salva em arquivo.
+    """
+    # matplotlib só é carregado quando há algo a plotar
+    import matplotlib.pyplot as plt
+
+    analyzer = DeclineCurveAnalyzer()
+    len_hist = len(y_prod)
+    
+    # Datas futuras
+    ultima_data = pd.to_datetime(datas[-1])
+    datas_futuras = pd.date_range(start=ultima_data + pd.Timedelta(days=30), periods=len(previsao), freq='ME')
+    
+    # Calcular curva ajustada sobre o histórico (para plotar o fit)
+    ajuste_historico = analyzer.forecast_from_parameters(resultados, 0, len_hist)
+    
+    plt.figure(figsize=(10, 6))
+    plt.scatter(datas, y_prod, alpha=0.5, color='gray', label='Histórico Real (Simulado)', s=10)
+    plt.plot(datas, ajuste_historico, color='blue', linewidth=2, label='Ajuste DCA')
+    plt.plot(datas_futuras, previsao, color='green', linestyle='--', linewidth=2, label=f'Previsão ({len(previsao) // 12} anos)')
+    
+    plt.title(f"Análise de Declínio de Produção - {campo}")
+    plt.xlabel("Data")
+    plt.ylabel("Produção (bbl/dia)")
+    plt.legend()
+    plt.grid(True, alpha=0.3)
+    
+    plt.savefig(output_file)
+    plt.close()
+    return output_file
+
 def teste_dca_simulacao():
     print("Iniciando teste de fluxo de análise...")
     
@@ -43,27 +74,9 @@ def teste_dca_simulacao():
         len_hist = len(y_prod)
         previsao = analyzer.forecast_from_parameters(resultados, tempo_inicio_previsao=len_hist, duracao_meses=60)
         
-        # Datas futuras
-        ultima_data = pd.to_datetime(datas[-1])
-        datas_futuras = pd.date_range(start=ultima_data + pd.Timedelta(days=30), periods=60, freq='ME')
-        
-        # Calcular curva ajustada sobre o histórico (para plotar o fit)
-        ajuste_historico = analyzer.forecast_from_parameters(resultados, 0, len_hist)
-        
         # 4. Plotar Resultados
-        plt.figure(figsize=(10, 6))
-        plt.scatter(datas, y_prod, alpha=0.5, color='gray', label='Histórico Real (Simulado)', s=10)
-        plt.plot(datas, ajuste_historico, color='blue', linewidth=2, label='Ajuste DCA')
-        plt.plot(datas_futuras, previsao, color='green', linestyle='--', linewidth=2, label='Previsão (5 anos)')
-        
-        plt.title(f"Análise de Declínio de Produção - {campo_alvo}")
-        plt.xlabel("Data")
-        plt.ylabel("Produção (bbl/dia)")
-        plt.legend()
-        plt.grid(True, alpha=0.3)
-        
         output_file = os.path.join(os.path.dirname(__file__), '../visualizacao/dca_teste.png')
-        plt.savefig(output_file)
+        plotar_resultado_dca(campo_alvo, datas, y_prod, resultados, previsao, output_file)
         print(f"Gráfico salvo em: {output_file}")
         
     else:
@@ -0,0 +1,64 @@
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from analise.curvas_tipo import BibliotecaAnalogos
+from analise.engenharia_reservatorios import DeclineCurveAnalyzer
+
+
+def biblioteca_sintetica(n_pocos, n_meses=13, ruido=0.05, seed=0):
+    """
+    Gera curvas normalizadas e parâmetros de Arps para n_pocos sem passar por
+    DataFrames (o ajuste de um milhão de poços não é o objeto deste benchmark).
+    """
+    rng = np.random.default_rng(seed)
+    di = rng.uniform(0.05, 0.6, n_pocos).astype(np.float32) / 12.0
+    b = rng.uniform(0.05, 1.2, n_pocos).astype(np.float32)
+    curvas = DeclineCurveAnalyzer.arps_vetorizado(np.arange(n_meses), np.ones(n_pocos), di, b).astype(np.float32)
+    curvas *= rng.normal(1, ruido, curvas.shape).astype(np.float32)
+    ids = np.arange(n_pocos)
+    return ids, curvas, di, b
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark da busca de poços análogos (KD-tree).")
+    parser.add_argument('--pocos', type=int, default=1_000_000, help="Tamanho da biblioteca.")
+    parser.add_argument('--consultas', type=int, default=2000)
+    parser.add_argument('--k', type=int, default=10)
+    args = parser.parse_args(argv)
+
+    ids, curvas, di, b = biblioteca_sintetica(args.pocos)
+    inicio = time.perf_counter()
+    biblioteca = BibliotecaAnalogos().construir(ids, curvas, di, b)
+    print(f"Biblioteca com {args.pocos} poços construída em {time.perf_counter() - inicio:.1f}s")
+    ultimo_mes = max(biblioteca.meses_amostra)
+    for rotulo, curva in sorted(biblioteca.curvas_tipo.items()):
+        print(f"  curva-tipo {rotulo}: {curva['n_pocos']:>8} poços, q/qi em t={ultimo_mes} meses = "
+              f"{curva['p50'][ultimo_mes]:.2f}")
+
+    # Consultas: poços novos com ruído diferente dos da biblioteca
+    _, q_curvas, q_di, q_b = biblioteca_sintetica(args.consultas, seed=1)
+    latencias = []
+    for i in range(args.consultas):
+        inicio = time.perf_counter()
+        biblioteca.buscar_analogos(q_curvas[i], q_di[i], q_b[i], k=args.k)
+        latencias.append((time.perf_counter() - inicio) * 1e6)
+    percentis = statistics.quantiles(latencias, n=100, method='inclusive')
+    print(f"Consulta unitária (k={args.k}): p50 = {percentis[49]:.0f} µs, p99 = {percentis[98]:.0f} µs")
+
+    inicio = time.perf_counter()
+    biblioteca.buscar_analogos_lote(q_curvas, q_di, q_b, k=args.k)
+    duracao = time.perf_counter() - inicio
+    print(f"Consulta em lote: {args.consultas} poços em {duracao * 1000:.1f} ms "
+          f"({duracao / args.consultas * 1e6:.0f} µs/poço)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+import argparse
+import os
+import subprocess
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Pilhas pesadas que só devem ser carregadas quando realmente usadas
+PILHAS_GEO = ('geopandas', 'shapely', 'pyproj', 'fiona', 'pyogrio')
+PILHAS_PLOT = ('matplotlib', 'folium', 'branca', 'plotly')
+
+# (nome, código executado, módulos proibidos)
+CENARIOS = [
+    ('import pacotes', "import dados, analise, geografia, visualizacao, pipeline",
+     PILHAS_GEO + PILHAS_PLOT + ('scipy', 'sklearn', 'pandas')),
+    ('CLI do pipeline', "import pipeline.dag, pipeline.etapas",
+     PILHAS_GEO + PILHAS_PLOT + ('scipy', 'sklearn')),
+    ('job somente DCA',
+     "from pipeline.etapas import etapa_carregar, etapa_ajustar, etapa_prever\n"
+     "df = etapa_carregar()\n"
+     "etapa_prever(df, etapa_ajustar(df))",
+     PILHAS_GEO + PILHAS_PLOT + ('sklearn',)),
+    ('módulo do mapa', "import visualizacao.mapa_interativo", PILHAS_GEO + PILHAS_PLOT),
+]
+
+
+def medir_importacao(codigo):
+    """
+    Executa o código em um interpretador novo com `-X importtime`.
+    Retorna (tempo total de importação em ms, conjunto de módulos importados).
+    """
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', codigo],
+        cwd=RAIZ, capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"Falha ao executar cenário:\n{proc.stderr[-2000:]}")
+
+    total_us = 0
+    modulos = set()
+    for linha in proc.stderr.splitlines():
+        if not linha.startswith('import time:') or 'imported package' in linha:
+            continue
+        _, cumulativo, nome = linha.split('|', 2)
+        nome = nome[1:]
+        modulos.add(nome.strip().split('.')[0])
+        # Só somamos importações de nível superior (sem indentação)
+        if not nome.startswith(' '):
+            total_us += int(cumulativo)
+    return total_us / 1000.0, modulos
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark do tempo de inicialização (python -X importtime).")
+    parser.add_argument('--repeticoes', type=int, default=3, help="Execuções por cenário (reporta a menor).")
+    args = parser.parse_args(argv)
+
+    violacoes = 0
+    print(f"{'Cenário':<22}{'Importação (ms)':>16}  Pilhas pesadas carregadas")
+    for nome, codigo, proibidos in CENARIOS:
+        tempos = []
+        for _ in range(args.repeticoes):
+            tempo_ms, modulos = medir_importacao(codigo)
+            tempos.append(tempo_ms)
+        pesados = sorted(m for m in modulos if m in PILHAS_GEO + PILHAS_PLOT + ('scipy', 'sklearn', 'pandas'))
+        indevidos = sorted(m for m in modulos if m in proibidos)
+        print(f"{nome:<22}{min(tempos):>16.1f}  {', '.join(pesados) or '-'}")
+        if indevidos:
+            violacoes += 1
+            print(f"  ERRO: '{nome}' carregou {', '.join(indevidos)}")
+
+    return 1 if violacoes else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+
+def _requisicao(url, corpo=None):
+    """
+    Executa uma requisição (GET ou POST JSON) e retorna a latência em ms.
+    """
+    dados = None
+    cabecalhos = {}
+    if corpo is not None:
+        dados = json.dumps(corpo).encode()
+        cabecalhos['Content-Type'] = 'application/json'
+    inicio = time.perf_counter()
+    with urllib.request.urlopen(urllib.request.Request(url, data=dados, headers=cabecalhos)) as resp:
+        resp.read()
+    return (time.perf_counter() - inicio) * 1000.0
+
+
+def montar_consultas(base, ids, n, tamanho_lote, semente=0):
+    """
+    Gera uma mistura de consultas unitárias (quentes, passam pelo cache LRU)
+    e em lote, parecida com o tráfego esperado dos consumidores.
+    """
+    rng = random.Random(semente)
+    consultas = []
+    for _ in range(n):
+        tipo = rng.choices(['parametros', 'previsao', 'eur', 'geo', 'lote_previsao', 'lote_geo'],
+                           weights=[25, 25, 15, 20, 10, 5])[0]
+        poco = urllib.parse.quote(rng.choice(ids))
+        if tipo == 'parametros':
+            consultas.append((tipo, f"{base}/pocos/{poco}/parametros", None))
+        elif tipo == 'previsao':
+            consultas.append((tipo, f"{base}/pocos/{poco}/previsao?meses={rng.choice([12, 60, 120])}", None))
+        elif tipo == 'eur':
+            consultas.append((tipo, f"{base}/pocos/{poco}/eur", None))
+        elif tipo == 'geo':
+            lat, lon = round(rng.uniform(8.0, 12.0), 2), round(rng.uniform(-73.0, -62.0), 2)
+            consultas.append((tipo, f"{base}/geo/localizar?lat={lat}&lon={lon}", None))
+        elif tipo == 'lote_previsao':
+            corpo = {'ids': [rng.choice(ids) for _ in range(tamanho_lote)], 'meses': 60}
+            consultas.append((tipo, f"{base}/lote/previsao", corpo))
+        else:
+            corpo = {'lats': [rng.uniform(8.0, 12.0) for _ in range(tamanho_lote)],
+                     'lons': [rng.uniform(-73.0, -62.0) for _ in range(tamanho_lote)]}
+            consultas.append((tipo, f"{base}/lote/geo/localizar", corpo))
+    return consultas
+
+
+def _p50_p99(valores):
+    """
+    Percentis 50 e 99 das latências; com uma única amostra, ela mesma
+    (statistics.quantiles exige ao menos duas).
+    """
+    if len(valores) < 2:
+        return valores[0], valores[0]
+    percentis = statistics.quantiles(valores, n=100, method='inclusive')
+    return percentis[49], percentis[98]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Teste de carga do serviço de consultas (latências p50/p99).")
+    parser.add_argument('--url', default='http://127.0.0.1:8000')
+    parser.add_argument('--clientes', type=int, default=16, help="Clientes concorrentes.")
+    parser.add_argument('--requisicoes', type=int, default=2000, help="Total de requisições.")
+    parser.add_argument('--lote', type=int, default=1000, help="Itens por requisição em lote.")
+    args = parser.parse_args(argv)
+
+    with urllib.request.urlopen(f"{args.url}/pocos") as resp:
+        ids = json.loads(resp.read())['ids']
+    if not ids:
+        print("Serviço sem poços carregados.")
+        return 1
+
+    consultas = montar_consultas(args.url, ids, args.requisicoes, args.lote)
+
+    # Aquecimento (conexões e caches)
+    for _, url, corpo in consultas[:50]:
+        _requisicao(url, corpo)
+
+    latencias = {}
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.clientes) as executor:
+        futuros = [(tipo, executor.submit(_requisicao, url, corpo)) for tipo, url, corpo in consultas]
+        for tipo, futuro in futuros:
+            latencias.setdefault(tipo, []).append(futuro.result())
+    duracao = time.perf_counter() - inicio
+
+    print(f"{args.requisicoes} requisições, {args.clientes} clientes, {duracao:.2f}s "
+          f"({args.requisicoes / duracao:.0f} req/s)")
+    print(f"  {'Consulta':<16}{'n':>7}{'p50 (ms)':>11}{'p99 (ms)':>11}")
+    todas = []
+    for tipo in sorted(latencias):
+        valores = latencias[tipo]
+        todas.extend(valores)
+        p50, p99 = _p50_p99(valores)
+        print(f"  {tipo:<16}{len(valores):>7}{p50:>11.2f}{p99:>11.2f}")
+    p50, p99 = _p50_p99(todas)
+    print(f"  {'total':<16}{len(todas):>7}{p50:>11.2f}{p99:>11.2f}")
+
+    with urllib.request.urlopen(f"{args.url}/cache/estatisticas") as resp:
+        print("Cache LRU:", json.loads(resp.read()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,10 @@
+"""Ingestão e simulação de dados de produção (OPEP, EIA, BP, Satélite)."""
+from exportacao_tardia import exportar_sob_demanda
+
+_EXPORTS = {
+    'OpecDataLoader': 'ingestao',
+    'SimuladorProducao': 'simulacao',
+    'GerenciadorDadosPetroleo': 'gerenciador_dados',
+}
+
+__getattr__, __dir__, __all__ = exportar_sob_demanda(__name__, _EXPORTS)
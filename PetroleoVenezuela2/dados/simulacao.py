@@ -69,3 +69,36 @@ class SimuladorProducao:
             dfs.append(df)
             
         return pd.concat(dfs, ignore_index=True)
+
+    def simular_portfolio(self, n_pocos, data_inicio='2015-01-01', n_meses=96, ruido=0.05):
+        """
+        Gera históricos mensais para um portfólio sintético de poços, de forma
+        vetorizada (uma matriz poços x meses), para testes em escala de portfólio.
+        Cada poço recebe parâmetros de Arps aleatórios e é atribuído a um campo
+        de Maracaibo ou a um bloco da Faixa do Orinoco.
+        """
+        datas = pd.date_range(start=data_inicio, periods=n_meses, freq='ME')
+        meses = np.arange(n_meses)[None, :]
+        
+        # Parâmetros por poço (colunas para broadcast com os meses)
+        qi = np.random.lognormal(np.log(800), 0.6, n_pocos)[:, None]
+        di = np.random.uniform(0.05, 0.6, n_pocos)[:, None] / 12.0
+        b = np.random.uniform(0.05, 1.2, n_pocos)[:, None]
+        
+        q = qi / ((1 + b * di * meses)**(1/b))
+        fator_ruido = np.random.normal(1, ruido, size=q.shape)
+        eventos = np.random.choice([1.0, 0.8, 0.5], size=q.shape, p=[0.95, 0.04, 0.01])
+        producao = np.maximum(q * fator_ruido * eventos, 0)
+        
+        campos = ['Campo Tia Juana', 'Campo Lagunillas', 'Campo Bachaquero',
+                  'Boyacá', 'Junín', 'Ayacucho', 'Carabobo']
+        campo_poco = np.random.choice(campos, size=n_pocos)
+        ids = np.array([f"POCO-{i:07d}" for i in range(n_pocos)])
+        
+        return pd.DataFrame({
+            'data': np.tile(datas.values, n_pocos),
+            'poco': np.repeat(ids, n_meses),
+            'campo': np.repeat(campo_poco, n_meses),
+            'producao_bpd': producao.ravel().astype(int),
+            'metodo_recuperacao': 'Primaria/Secundaria'
+        })
@@ -0,0 +1,45 @@
+import argparse
+import os
+import shutil
+
+RAIZ = os.path.dirname(os.path.abspath(__file__))
+
+from pipeline.dag import PipelineDAG
+from pipeline.etapas import construir_pipeline
+
+
+def main(argv=None):
+    """
+    Ponto de entrada headless: executa o pipeline completo como um DAG.
+    """
+    parser = argparse.ArgumentParser(description="Pipeline analítico do petróleo venezuelano (execução em lote).")
+    parser.add_argument('--saida', default=os.path.join(RAIZ, 'visualizacao'),
+                        help="Diretório onde gráficos e mapas serão gravados.")
+    parser.add_argument('--cache', default=os.path.join(RAIZ, '.cache_pipeline'),
+                        help="Diretório do cache de saídas intermediárias.")
+    parser.add_argument('--sem-cache', action='store_true', help="Ignora o cache e reexecuta todas as etapas.")
+    parser.add_argument('--limpar-cache', action='store_true', help="Apaga o cache antes de executar.")
+    parser.add_argument('--sequencial', action='store_true', help="Executa uma etapa por vez (sem paralelismo).")
+    parser.add_argument('--workers', type=int, default=None, help="Número máximo de processos paralelos.")
+    parser.add_argument('--meses', type=int, default=60, help="Horizonte da previsão em meses.")
+    parser.add_argument('--etapas', nargs='*', default=None,
+                        help="Executa apenas estas etapas (e suas dependências).")
+    args = parser.parse_args(argv)
+
+    if args.limpar_cache and os.path.isdir(args.cache):
+        shutil.rmtree(args.cache)
+
+    dag = PipelineDAG(
+        diretorio_cache=args.cache,
+        usar_cache=not args.sem_cache,
+        max_workers=args.workers,
+        paralelo=not args.sequencial
+    )
+    construir_pipeline(dag, os.path.abspath(args.saida), meses_previsao=args.meses)
+
+    dag.executar(args.etapas)
+    dag.imprimir_resumo()
+
+
+if __name__ == "__main__":
+    main()
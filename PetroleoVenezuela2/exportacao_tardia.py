@@ -0,0 +1,26 @@
+"""
+Exportação sob demanda (PEP 562) para os pacotes do projeto: importar um
+pacote não carrega as dependências pesadas dos seus módulos; cada símbolo
+é importado no primeiro acesso e guardado no namespace do pacote.
+"""
+import importlib
+import sys
+
+
+def exportar_sob_demanda(nome_pacote, exports):
+    """
+    Retorna (__getattr__, __dir__, __all__) para o __init__ do pacote.
+    exports: dicionário {símbolo: submódulo que o define}.
+    """
+    def __getattr__(nome):
+        if nome in exports:
+            modulo = importlib.import_module(f".{exports[nome]}", nome_pacote)
+            valor = getattr(modulo, nome)
+            setattr(sys.modules[nome_pacote], nome, valor)
+            return valor
+        raise AttributeError(f"module {nome_pacote!r} has no attribute {nome!r}")
+
+    def __dir__():
+        return sorted(set(vars(sys.modules[nome_pacote])) | set(exports))
+
+    return __getattr__, __dir__, list(exports)
@@ -0,0 +1,13 @@
+"""Camadas espaciais: bacias, campos, blocos, poços e espaçamento."""
+from exportacao_tardia import exportar_sob_demanda
+
+_EXPORTS = {
+    'criar_bacia_maracaibo_detalhada': 'camadas_geo',
+    'criar_faja_orinoco_blocos': 'camadas_geo',
+    'criar_infraestrutura_avancada': 'camadas_geo',
+    'criar_poligonos_producao': 'pocos',
+    'criar_camada_pocos': 'pocos',
+    'AnaliseEspacamento': 'espacamento',
+}
+
+__getattr__, __dir__, __all__ = exportar_sob_demanda(__name__, _EXPORTS)
@@ -0,0 +1,111 @@
+import geopandas as gpd
+import numpy as np
+import shapely
+from scipy.spatial import cKDTree
+
+# REGVEN / UTM zona 19N. Uma única projeção métrica para todo o país: cobre
+# Maracaibo e o Orinoco com erro de escala < 1%, suficiente para espaçamento.
+CRS_PROJETADO = "EPSG:2202"
+
+
+class AnaliseEspacamento:
+    """
+    Análise de espaçamento e interferência entre poços.
+
+    As coordenadas são projetadas para um CRS métrico uma única vez, em lote,
+    e indexadas em uma KD-tree; todas as consultas (vizinho mais próximo,
+    interferência, densidade, infill) trabalham sobre arrays numpy.
+    """
+
+    def __init__(self, gdf_pocos, poligonos, crs_projetado=CRS_PROJETADO):
+        self.crs_projetado = crs_projetado
+        self.pocos = gdf_pocos.reset_index(drop=True)
+        self.poligonos = poligonos.reset_index(drop=True)
+
+        # Transformação em lote (uma chamada para todos os pontos/polígonos)
+        self.xy = shapely.get_coordinates(self.pocos.geometry.to_crs(crs_projetado).values)
+        self.poligonos_proj = self.poligonos.geometry.to_crs(crs_projetado).values
+        self.arvore = cKDTree(self.xy)
+        self._distancias_vizinho = None
+
+    def distancias_vizinho_mais_proximo(self):
+        """
+        Distância (m) de cada poço ao poço mais próximo.
+        """
+        if self._distancias_vizinho is None:
+            if len(self.xy) < 2:
+                self._distancias_vizinho = np.full(len(self.xy), np.inf)
+            else:
+                distancias, _ = self.arvore.query(self.xy, k=2, workers=-1)
+                self._distancias_vizinho = distancias[:, 1]
+        return self._distancias_vizinho
+
+    def interferencia(self, raio_m):
+        """
+        Número de vizinhos de cada poço dentro do raio de interferência e
+        os pares de poços mais próximos que o raio (índices, distância em m).
+        """
+        vizinhos = self.arvore.query_ball_point(self.xy, r=raio_m, return_length=True, workers=-1) - 1
+        pares = self.arvore.query_pairs(r=raio_m, output_type='ndarray')
+        distancias = np.linalg.norm(self.xy[pares[:, 0]] - self.xy[pares[:, 1]], axis=1)
+        return vizinhos, pares, distancias
+
+    def _poligono_de_cada_poco(self):
+        """
+        Índice do polígono que contém cada poço (-1 se nenhum), via STRtree.
+        """
+        arvore = shapely.STRtree(self.poligonos_proj)
+        pontos = shapely.points(self.xy)
+        idx_pontos, idx_poligonos = arvore.query(pontos, predicate='within')
+        resultado = np.full(len(self.xy), -1, dtype=int)
+        resultado[idx_pontos] = idx_poligonos
+        return resultado
+
+    def densidade_por_poligono(self):
+        """
+        Poços, área (km²), densidade (poços/km²) e espaçamento médio por polígono.
+        Retorna um GeoDataFrame em EPSG:4326, pronto para o mapa.
+        """
+        poligono = self._poligono_de_cada_poco()
+        dentro = poligono >= 0
+        n = len(self.poligonos)
+
+        contagem = np.bincount(poligono[dentro], minlength=n)
+        soma_distancias = np.bincount(poligono[dentro], weights=self.distancias_vizinho_mais_proximo()[dentro],
+                                      minlength=n)
+        area_km2 = shapely.area(self.poligonos_proj) / 1e6
+
+        resultado = self.poligonos.copy()
+        resultado['n_pocos'] = contagem
+        resultado['area_km2'] = np.round(area_km2, 1)
+        resultado['densidade_pocos_km2'] = np.round(contagem / area_km2, 4)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            resultado['espacamento_medio_m'] = np.round(soma_distancias / contagem, 1)
+        return resultado
+
+    def candidatos_infill(self, espacamento_alvo_m=500.0):
+        """
+        Locais candidatos a poços de adensamento (infill): nós de uma grade com
+        passo igual ao espaçamento alvo, dentro de cada polígono, cuja distância
+        ao poço existente mais próximo é pelo menos o espaçamento alvo.
+        """
+        xs, ys, nomes = [], [], []
+        for nome, geometria in zip(self.poligonos['nome'], self.poligonos_proj):
+            minx, miny, maxx, maxy = geometria.bounds
+            gx, gy = np.meshgrid(np.arange(minx + espacamento_alvo_m / 2, maxx, espacamento_alvo_m),
+                                 np.arange(miny + espacamento_alvo_m / 2, maxy, espacamento_alvo_m))
+            gx, gy = gx.ravel(), gy.ravel()
+            dentro = shapely.contains_xy(geometria, gx, gy)
+            xs.append(gx[dentro])
+            ys.append(gy[dentro])
+            nomes.append(np.full(dentro.sum(), nome, dtype=object))
+
+        x, y = np.concatenate(xs), np.concatenate(ys)
+        distancias, _ = self.arvore.query(np.column_stack([x, y]), k=1, workers=-1)
+        livres = distancias >= espacamento_alvo_m
+
+        return gpd.GeoDataFrame(
+            {'campo': np.concatenate(nomes)[livres], 'distancia_poco_mais_proximo_m': np.round(distancias[livres], 1)},
+            geometry=gpd.points_from_xy(x[livres], y[livres]),
+            crs=self.crs_projetado
+        ).to_crs("EPSG:4326")
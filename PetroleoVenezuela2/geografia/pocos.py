@@ -0,0 +1,77 @@
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import shapely
+
+from geografia.camadas_geo import criar_bacia_maracaibo_detalhada, criar_faja_orinoco_blocos
+
+
+def criar_poligonos_producao():
+    """
+    Une os campos de Maracaibo e os blocos do Orinoco em uma única camada
+    de polígonos de produção (coluna 'nome').
+    """
+    _, gdf_campos = criar_bacia_maracaibo_detalhada()
+    gdf_faja = criar_faja_orinoco_blocos()
+    return gpd.GeoDataFrame(
+        pd.concat([gdf_campos[['nome', 'tipo', 'geometry']], gdf_faja[['nome', 'tipo', 'geometry']]],
+                  ignore_index=True),
+        crs="EPSG:4326"
+    )
+
+
+def _amostrar_no_poligono(poligono, n, rng):
+    """
+    Amostragem por rejeição, vetorizada: sorteia pontos no retângulo envolvente
+    e mantém os que caem dentro do polígono (shapely.contains_xy).
+    """
+    minx, miny, maxx, maxy = poligono.bounds
+    fracao = max(poligono.area / ((maxx - minx) * (maxy - miny)), 0.05)
+    xs, ys = [], []
+    faltam = n
+    while faltam > 0:
+        lote = int(faltam / fracao * 1.2) + 16
+        x = rng.uniform(minx, maxx, lote)
+        y = rng.uniform(miny, maxy, lote)
+        dentro = shapely.contains_xy(poligono, x, y)
+        xs.append(x[dentro][:faltam])
+        ys.append(y[dentro][:faltam])
+        faltam -= len(xs[-1])
+    return np.concatenate(xs), np.concatenate(ys)
+
+
+def criar_camada_pocos(pocos=None, n_pocos=20000, poligonos=None, seed=42):
+    """
+    Camada de localização de poços (pontos) dentro dos campos e blocos.
+
+    pocos: DataFrame opcional com colunas 'poco' e 'campo' (ex: saída de
+           SimuladorProducao.simular_portfolio); cada poço é posicionado no
+           polígono do seu campo. Se None, n_pocos poços são distribuídos
+           igualmente entre os polígonos.
+    """
+    rng = np.random.default_rng(seed)
+    if poligonos is None:
+        poligonos = criar_poligonos_producao()
+
+    if pocos is None:
+        campos = poligonos['nome'].values[np.arange(n_pocos) % len(poligonos)]
+        pocos = pd.DataFrame({'poco': [f"POCO-{i:07d}" for i in range(n_pocos)], 'campo': campos})
+    else:
+        pocos = pocos[['poco', 'campo']].drop_duplicates('poco').reset_index(drop=True)
+
+    lon = np.full(len(pocos), np.nan)
+    lat = np.full(len(pocos), np.nan)
+    geometrias = dict(zip(poligonos['nome'], poligonos.geometry))
+    for campo, indices in pocos.groupby('campo').indices.items():
+        if campo not in geometrias:
+            print(f"Aviso: campo sem polígono, poços ignorados: {campo}")
+            continue
+        lon[indices], lat[indices] = _amostrar_no_poligono(geometrias[campo], len(indices), rng)
+
+    validos = ~np.isnan(lon)
+    pocos = pocos[validos].reset_index(drop=True)
+    return gpd.GeoDataFrame(
+        pocos.assign(lat=lat[validos], lon=lon[validos]),
+        geometry=gpd.points_from_xy(lon[validos], lat[validos]),
+        crs="EPSG:4326"
+    )
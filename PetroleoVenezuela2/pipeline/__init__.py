@@ -0,0 +1,10 @@
+"""Orquestração do pipeline completo como um DAG com cache e etapas paralelas."""
+from exportacao_tardia import exportar_sob_demanda
+
+_EXPORTS = {
+    'PipelineDAG': 'dag',
+    'Etapa': 'dag',
+    'construir_pipeline': 'etapas',
+}
+
+__getattr__, __dir__, __all__ = exportar_sob_demanda(__name__, _EXPORTS)
@@ -0,0 +1,215 @@
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+
+def _executar_cronometrado(funcao, argumentos, params):
+    """
+    Executa uma etapa (no processo trabalhador) e mede o tempo gasto.
+    """
+    inicio = time.perf_counter()
+    resultado = funcao(*argumentos, **params)
+    return resultado, time.perf_counter() - inicio
+
+
+class Etapa:
+    """
+    Nó do DAG: uma função pura cujas entradas são as saídas das dependências.
+    arquivos: arquivos-fonte adicionais cujo conteúdo invalida o cache da etapa.
+    """
+
+    def __init__(self, nome, funcao, dependencias=(), params=None, arquivos=()):
+        self.nome = nome
+        self.funcao = funcao
+        self.dependencias = tuple(dependencias)
+        self.params = params or {}
+        self.arquivos = tuple(arquivos)
+
+
+class PipelineDAG:
+    """
+    Executa etapas organizadas como um grafo acíclico dirigido (DAG).
+
+    - Etapas independentes rodam em paralelo (processos trabalhadores).
+    - Cada saída é guardada em cache, indexada por uma chave que combina o
+      código do módulo da etapa (incluindo funções auxiliares), seus
+      parâmetros, arquivos rastreados e as chaves das dependências; assim,
+      só reexecutam as etapas cujas entradas mudaram.
+    - Ao final, registra o tempo de cada etapa para o resumo.
+    """
+
+    def __init__(self, diretorio_cache='.cache_pipeline', usar_cache=True, max_workers=None, paralelo=True):
+        self.diretorio_cache = diretorio_cache
+        self.usar_cache = usar_cache
+        self.max_workers = max_workers
+        self.paralelo = paralelo
+        self.etapas = {}
+        self.registro = {}  # nome -> (status, segundos)
+        self.tempo_total = 0.0
+
+    def adicionar(self, nome, funcao, dependencias=(), arquivos=(), **params):
+        if nome in self.etapas:
+            raise ValueError(f"Etapa duplicada: {nome}")
+        for dep in dependencias:
+            if dep not in self.etapas:
+                raise ValueError(f"Etapa '{nome}' depende de '{dep}', que não foi registrada.")
+        self.etapas[nome] = Etapa(nome, funcao, dependencias, params, arquivos)
+        return self
+
+    def _ordem_topologica(self, alvos=None):
+        """
+        Retorna as etapas necessárias para os alvos, em ordem topológica.
+        Como dependências precisam existir no momento do registro, a ordem
+        de inserção já é topológica; aqui apenas filtramos os ancestrais.
+        """
+        if not alvos:
+            return list(self.etapas)
+
+        necessarias = set()
+        pilha = list(alvos)
+        while pilha:
+            nome = pilha.pop()
+            if nome not in self.etapas:
+                raise ValueError(f"Etapa desconhecida: {nome}")
+            if nome not in necessarias:
+                necessarias.add(nome)
+                pilha.extend(self.etapas[nome].dependencias)
+        return [nome for nome in self.etapas if nome in necessarias]
+
+    def _chave(self, etapa, chaves_dependencias):
+        h = hashlib.sha256()
+        h.update(etapa.nome.encode())
+        # Módulo inteiro: auxiliares chamados pela etapa também invalidam o cache
+        modulo = inspect.getmodule(etapa.funcao)
+        h.update(inspect.getsource(modulo if modulo is not None else etapa.funcao).encode())
+        h.update(json.dumps(etapa.params, sort_keys=True, default=str).encode())
+        for caminho in etapa.arquivos:
+            with open(caminho, 'rb') as f:
+                h.update(f.read())
+        for chave in chaves_dependencias:
+            h.update(chave.encode())
+        return h.hexdigest()
+
+    def _caminho_cache(self, nome, chave):
+        return os.path.join(self.diretorio_cache, f"{nome}-{chave[:16]}.pkl")
+
+    @staticmethod
+    def _saidas_existem(resultado):
+        """
+        Etapas de renderização retornam caminhos; se o arquivo sumiu, o cache não vale.
+        """
+        if isinstance(resultado, str):
+            return os.path.exists(resultado)
+        if isinstance(resultado, (list, tuple)) and resultado and all(isinstance(r, str) for r in resultado):
+            return all(os.path.exists(r) for r in resultado)
+        return True
+
+    def _ler_cache(self, nome, chave):
+        if not self.usar_cache:
+            return None
+        caminho = self._caminho_cache(nome, chave)
+        if not os.path.exists(caminho):
+            return None
+        try:
+            with open(caminho, 'rb') as f:
+                resultado = pickle.load(f)
+        except Exception as e:
+            print(f"Aviso: cache corrompido para '{nome}' ({e}); reexecutando.")
+            return None
+        if not self._saidas_existem(resultado):
+            return None
+        return (resultado,)
+
+    def _gravar_cache(self, nome, chave, resultado):
+        if not self.usar_cache:
+            return
+        os.makedirs(self.diretorio_cache, exist_ok=True)
+        # Remove versões antigas da mesma etapa
+        for arquivo in os.listdir(self.diretorio_cache):
+            if arquivo.startswith(f"{nome}-") and arquivo.endswith('.pkl'):
+                os.remove(os.path.join(self.diretorio_cache, arquivo))
+        caminho_tmp = self._caminho_cache(nome, chave) + '.tmp'
+        with open(caminho_tmp, 'wb') as f:
+            pickle.dump(resultado, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(caminho_tmp, self._caminho_cache(nome, chave))
+
+    def executar(self, alvos=None):
+        """
+        Executa o DAG (ou apenas os ancestrais dos alvos) e retorna {etapa: saída}.
+        """
+        inicio_total = time.perf_counter()
+        pendentes = self._ordem_topologica(alvos)
+        resultados = {}
+        chaves = {}
+        em_execucao = {}
+        self.registro = {}
+
+        if self.paralelo:
+            executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        else:
+            executor = ThreadPoolExecutor(max_workers=1)
+
+        try:
+            while pendentes or em_execucao:
+                # Despacha toda etapa cujas dependências já estão prontas
+                liberou = True
+                while liberou:
+                    liberou = False
+                    for nome in list(pendentes):
+                        etapa = self.etapas[nome]
+                        if not all(dep in resultados for dep in etapa.dependencias):
+                            continue
+                        pendentes.remove(nome)
+                        chave = self._chave(etapa, [chaves[dep] for dep in etapa.dependencias])
+                        chaves[nome] = chave
+
+                        inicio = time.perf_counter()
+                        em_cache = self._ler_cache(nome, chave)
+                        if em_cache is not None:
+                            resultados[nome] = em_cache[0]
+                            self.registro[nome] = ('cache', time.perf_counter() - inicio)
+                            liberou = True  # pode liberar dependentes imediatamente
+                            continue
+
+                        argumentos = [resultados[dep] for dep in etapa.dependencias]
+                        futuro = executor.submit(_executar_cronometrado, etapa.funcao, argumentos, etapa.params)
+                        em_execucao[futuro] = nome
+
+                if not em_execucao:
+                    continue
+
+                concluidos, _ = wait(em_execucao, return_when=FIRST_COMPLETED)
+                for futuro in concluidos:
+                    nome = em_execucao.pop(futuro)
+                    try:
+                        resultado, duracao = futuro.result()
+                    except Exception as e:
+                        print(f"Erro na etapa '{nome}': {e}")
+                        raise
+                    resultados[nome] = resultado
+                    self.registro[nome] = ('executada', duracao)
+                    self._gravar_cache(nome, chaves[nome], resultado)
+        finally:
+            executor.shutdown(cancel_futures=True)
+
+        self.tempo_total = time.perf_counter() - inicio_total
+        return resultados
+
+    def imprimir_resumo(self):
+        """
+        Imprime o tempo de cada etapa e se ela foi executada ou lida do cache.
+        """
+        print("\nResumo do pipeline (tempo por etapa):")
+        print(f"  {'Etapa':<22}{'Status':<12}{'Tempo (s)':>10}")
+        for nome in self.etapas:
+            if nome not in self.registro:
+                continue
+            status, segundos = self.registro[nome]
+            print(f"  {nome:<22}{status:<12}{segundos:>10.2f}")
+        soma = sum(segundos for _, segundos in self.registro.values())
+        print(f"  {'Soma das etapas':<34}{soma:>10.2f}")
+        print(f"  {'Tempo total (parede)':<34}{self.tempo_total:>10.2f}")
@@ -0,0 +1,232 @@
+import os
+
+# As dependências de cada etapa são importadas dentro da própria etapa: um job
+# que executa apenas 'prever' nunca carrega geopandas, folium, plotly ou matplotlib.
+
+RAIZ_PROJETO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def etapa_carregar():
+    """
+    Carrega (ou simula) o histórico mensal de produção por campo.
+    """
+    from dados.ingestao import OpecDataLoader
+
+    loader = OpecDataLoader()
+    return loader.carregar_producao_mensal()
+
+
+def etapa_ajustar(df_prod):
+    """
+    Ajusta uma curva de Arps para cada campo do histórico.
+    """
+    from analise.engenharia_reservatorios import DeclineCurveAnalyzer
+
+    analyzer = DeclineCurveAnalyzer()
+    ajustes = {}
+    for campo, df_campo in df_prod.groupby('campo'):
+        df_campo = df_campo.sort_values('data')
+        ajustes[campo] = analyzer.fit_decline_curve(df_campo['data'].values, df_campo['producao_bpd'].values)
+    return ajustes
+
+
+def etapa_prever(df_prod, ajustes, meses=60):
+    """
+    Prevê a produção dos próximos meses a partir do fim do histórico de cada campo.
+    """
+    from analise.engenharia_reservatorios import DeclineCurveAnalyzer
+
+    analyzer = DeclineCurveAnalyzer()
+    meses_historico = df_prod.groupby('campo').size()
+    previsoes = {}
+    for campo, params in ajustes.items():
+        if not params.get('success'):
+            continue
+        previsoes[campo] = analyzer.forecast_from_parameters(params, int(meses_historico[campo]), meses)
+    return previsoes
+
+
+def etapa_geo():
+    """
+    Monta as camadas geográficas (bacias, campos, blocos e infraestrutura).
+    """
+    from geografia.camadas_geo import criar_bacia_maracaibo_detalhada, criar_faja_orinoco_blocos, criar_infraestrutura_avancada
+
+    gdf_bacia, gdf_campos = criar_bacia_maracaibo_detalhada()
+    gdf_infra, gdf_dutos = criar_infraestrutura_avancada()
+    return {
+        'bacia_maracaibo': gdf_bacia,
+        'campos_maracaibo': gdf_campos,
+        'orinoco': criar_faja_orinoco_blocos(),
+        'infra': gdf_infra,
+        'dutos': gdf_dutos,
+    }
+
+
+def _campo_do_poligono(nome, campos):
+    """
+    Primeiro campo cujo nome contém o nome do polígono
+    (ex: bloco 'Carabobo' <-> 'Campo Carabobo (Faja)'), ou None.
+    """
+    return next((campo for campo in campos if nome in campo), None)
+
+
+def etapa_juncao_geo(camadas, ajustes):
+    """
+    Junta os parâmetros DCA aos polígonos de campos e blocos pelo nome
+    (ver _campo_do_poligono).
+    """
+    colunas = ['qi', 'di_anual_nominal', 'b', 'r2']
+    campos = [campo for campo, params in ajustes.items() if params.get('success')]
+    camadas = dict(camadas)
+    for chave in ('campos_maracaibo', 'orinoco'):
+        gdf = camadas[chave].copy()
+        for coluna in colunas:
+            gdf[coluna] = float('nan')
+        for idx, nome in gdf['nome'].items():
+            campo = _campo_do_poligono(nome, campos)
+            if campo is not None:
+                for coluna in colunas:
+                    gdf.at[idx, coluna] = round(float(ajustes[campo][coluna]), 4)
+        camadas[chave] = gdf
+    return camadas
+
+
+def etapa_espacamento(n_pocos=20000, espacamento_alvo_m=1000.0):
+    """
+    Gera a camada de poços e calcula densidade por polígono e locais de infill.
+    """
+    from geografia.pocos import criar_camada_pocos, criar_poligonos_producao
+    from geografia.espacamento import AnaliseEspacamento
+
+    poligonos = criar_poligonos_producao()
+    pocos = criar_camada_pocos(n_pocos=n_pocos, poligonos=poligonos)
+    analise = AnaliseEspacamento(pocos, poligonos)
+    return {
+        'pocos': pocos,
+        'densidade': analise.densidade_por_poligono(),
+        'infill': analise.candidatos_infill(espacamento_alvo_m),
+    }
+
+
+def etapa_agregados(df_prod, camadas, espacamento, resolucao=256, resolucao_superficie=1024,
+                    max_focos_flaring=500):
+    """
+    Pré-calcula as pirâmides agregadas usadas pelas visualizações: produção
+    (última produção de cada campo dividida entre seus poços), flaring,
+    reservas por polígono e a superfície do embasamento da bacia, além dos
+    max_focos_flaring focos de calor mais intensos (marcadores clicáveis do mapa).
+    O tamanho do resultado depende só das resoluções e do limite de focos,
+    não do número de poços ou de detecções.
+    """
+    import numpy as np
+    from dados.gerenciador_dados import GerenciadorDadosPetroleo
+    from visualizacao.agregados import PiramideAgregada
+    from visualizacao.vis_3d_bacia import criar_piramide_embasamento
+
+    # Produção: mesmo casamento por nome da junção geo
+    pocos = espacamento['pocos']
+    ultima = df_prod.sort_values('data').groupby('campo')['producao_bpd'].last()
+    producao_poligono = {}
+    for nome in pocos['campo'].unique():
+        campo = _campo_do_poligono(nome, ultima.index)
+        if campo is not None:
+            producao_poligono[nome] = float(ultima[campo])
+    pocos_por_campo = pocos['campo'].map(pocos['campo'].value_counts())
+    pesos = pocos['campo'].map(producao_poligono).fillna(0.0) / pocos_por_campo
+    producao = PiramideAgregada(resolucao_base=resolucao).acumular(pocos['lon'].values, pocos['lat'].values,
+                                                                   pesos.values)
+
+    df_satelite = GerenciadorDadosPetroleo().integracao_satelite_mock()
+    flaring = PiramideAgregada(resolucao_base=resolucao).acumular(
+        df_satelite['lon'].values, df_satelite['lat'].values,
+        np.where(df_satelite['intensidade'] == 'Alta', 1.0, 0.5)
+    )
+    prioridade = df_satelite['intensidade'].map({'Alta': 0, 'Media': 1, 'Baixa': 2}).fillna(3)
+    focos_flaring = df_satelite.loc[prioridade.sort_values(kind='stable').index[:max_focos_flaring]]
+
+    gdf_campos = camadas['campos_maracaibo']
+    reservas = PiramideAgregada(resolucao_base=resolucao).acumular_poligonos(
+        gdf_campos.geometry, gdf_campos['reservas_estimadas_gb'].values
+    )
+
+    return {
+        'producao': producao,
+        'flaring': flaring,
+        'focos_flaring': focos_flaring.reset_index(drop=True),
+        'reservas': reservas,
+        'embasamento': criar_piramide_embasamento(resolucao_superficie),
+    }
+
+
+def etapa_render_dca(df_prod, ajustes, previsoes, diretorio_saida, meses=60):
+    """
+    Salva um gráfico DCA (histórico + ajuste + previsão da etapa 'prever') por
+    campo, reaproveitando uma única figura Agg, e o gráfico de densidade das
+    curvas normalizadas.
+    """
+    from visualizacao.dca_lote import montar_tarefas, renderizar_lote, gerar_densidade_normalizada
+
+    caminhos, _ = renderizar_lote(montar_tarefas(df_prod, 'campo', ajustes, previsoes), diretorio_saida,
+                                  meses_previsao=meses, workers=1)
+    densidade = gerar_densidade_normalizada(df_prod, ajustes, os.path.join(diretorio_saida, 'dca_densidade.png'))
+    return caminhos + ([densidade] if densidade else [])
+
+
+def etapa_render_mapa(camadas, espacamento, agregados, diretorio_saida):
+    """
+    Gera o mapa interativo a partir das camadas já juntadas, da densidade de
+    poços e das pirâmides agregadas.
+    """
+    from visualizacao.mapa_interativo import gerar_mapa_avancado
+
+    os.makedirs(diretorio_saida, exist_ok=True)
+    return gerar_mapa_avancado(camadas, os.path.join(diretorio_saida, 'mapa_venezuela_avancado.html'),
+                               densidade=espacamento['densidade'], agregados=agregados)
+
+
+def etapa_render_3d(camadas, agregados, diretorio_saida):
+    """
+    Gera o modelo 3D da Bacia de Maracaibo sobre a superfície pré-calculada.
+    """
+    from visualizacao.vis_3d_bacia import gerar_visualizacao_3d_maracaibo
+
+    os.makedirs(diretorio_saida, exist_ok=True)
+    return gerar_visualizacao_3d_maracaibo(camadas['campos_maracaibo'],
+                                           os.path.join(diretorio_saida, 'bacia_maracaibo_3d.html'),
+                                           superficie=agregados['embasamento'])
+
+
+def _fontes(*caminhos):
+    return [os.path.join(RAIZ_PROJETO, c) for c in caminhos]
+
+
+def construir_pipeline(dag, diretorio_saida, meses_previsao=60):
+    """
+    Registra no DAG o fluxo completo:
+    carregar -> ajustar -> prever / junção geo / agregados -> renderizações (em paralelo).
+    """
+    dag.adicionar('carregar', etapa_carregar,
+                  arquivos=_fontes('dados/ingestao.py', 'dados/simulacao.py'))
+    dag.adicionar('ajustar', etapa_ajustar, ['carregar'],
+                  arquivos=_fontes('analise/engenharia_reservatorios.py'))
+    dag.adicionar('prever', etapa_prever, ['carregar', 'ajustar'], meses=meses_previsao,
+                  arquivos=_fontes('analise/engenharia_reservatorios.py'))
+    dag.adicionar('geo', etapa_geo,
+                  arquivos=_fontes('geografia/camadas_geo.py'))
+    dag.adicionar('juncao_geo', etapa_juncao_geo, ['geo', 'ajustar'])
+    dag.adicionar('espacamento', etapa_espacamento,
+                  arquivos=_fontes('geografia/pocos.py', 'geografia/espacamento.py', 'geografia/camadas_geo.py'))
+    dag.adicionar('agregados', etapa_agregados, ['carregar', 'geo', 'espacamento'],
+                  arquivos=_fontes('visualizacao/agregados.py', 'visualizacao/vis_3d_bacia.py',
+                                   'dados/gerenciador_dados.py'))
+    dag.adicionar('render_dca', etapa_render_dca, ['carregar', 'ajustar', 'prever'],
+                  diretorio_saida=diretorio_saida, meses=meses_previsao,
+                  arquivos=_fontes('visualizacao/dca_lote.py'))
+    dag.adicionar('render_mapa', etapa_render_mapa, ['juncao_geo', 'espacamento', 'agregados'],
+                  diretorio_saida=diretorio_saida,
+                  arquivos=_fontes('visualizacao/mapa_interativo.py', 'dados/gerenciador_dados.py'))
+    dag.adicionar('render_3d', etapa_render_3d, ['geo', 'agregados'],
+                  diretorio_saida=diretorio_saida,
+                  arquivos=_fontes('visualizacao/vis_3d_bacia.py'))
+    return dag
@@ -0,0 +1,9 @@
+"""Serviço HTTP local de consultas (parâmetros, previsões, EUR e localização)."""
+from exportacao_tardia import exportar_sob_demanda
+
+_EXPORTS = {
+    'EstadoServico': 'estado',
+    'criar_app': 'api',
+}
+
+__getattr__, __dir__, __all__ = exportar_sob_demanda(__name__, _EXPORTS)
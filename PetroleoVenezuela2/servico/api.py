@@ -0,0 +1,115 @@
+import argparse
+from contextlib import asynccontextmanager
+from typing import List, Optional
+
+from fastapi import FastAPI, HTTPException, Query, Response
+from pydantic import BaseModel, Field
+
+from servico.estado import EstadoServico
+
+# Limite de itens por requisição em lote
+MAX_LOTE = 50000
+
+
+class LotePrevisao(BaseModel):
+    ids: List[str] = Field(..., max_length=MAX_LOTE)
+    meses: int = Field(60, gt=0, le=1200)
+    # None: cada poço começa no fim do seu histórico
+    inicio: Optional[int] = Field(None, ge=0)
+
+
+class LoteEUR(BaseModel):
+    ids: List[str] = Field(..., max_length=MAX_LOTE)
+    q_limite: float = Field(50.0, gt=0)
+    horizonte_meses: int = Field(600, gt=0, le=1200)
+
+
+class LoteLocalizacao(BaseModel):
+    lats: List[float] = Field(..., max_length=MAX_LOTE)
+    lons: List[float] = Field(..., max_length=MAX_LOTE)
+
+
+def criar_app(estado=None):
+    """
+    Cria a aplicação FastAPI. O estado (parâmetros ajustados e índice geográfico)
+    é carregado uma única vez e mantido em memória.
+    """
+    @asynccontextmanager
+    async def ciclo_de_vida(app):
+        # Ajustes e índices são carregados uma vez, antes da primeira requisição
+        if app.state.estado is None:
+            app.state.estado = EstadoServico.do_pipeline()
+        yield
+
+    app = FastAPI(title="Petróleo Venezuela - Serviço de Consultas", lifespan=ciclo_de_vida)
+    app.state.estado = estado
+
+    def obter_estado():
+        return app.state.estado
+
+    # Consultas unitárias são buscas em memória/cache (sub-ms): rodam direto no
+    # event loop. As em lote são síncronas e vão para o pool de threads do FastAPI.
+    def resposta_json(corpo, erro):
+        if corpo is None:
+            raise HTTPException(status_code=404, detail=erro)
+        return Response(content=corpo, media_type='application/json')
+
+    @app.get('/saude')
+    async def saude():
+        return {'status': 'ok', 'pocos': len(obter_estado().ids)}
+
+    @app.get('/pocos')
+    async def listar_pocos():
+        return {'ids': obter_estado().ids}
+
+    @app.get('/pocos/{poco}/parametros')
+    async def parametros(poco: str):
+        return resposta_json(obter_estado().parametros_json(poco), f"Poço não encontrado: {poco}")
+
+    @app.get('/pocos/{poco}/previsao')
+    async def previsao(poco: str, meses: int = Query(60, gt=0, le=1200), inicio: Optional[int] = Query(None, ge=0)):
+        return resposta_json(obter_estado().previsao_json(poco, meses, inicio), f"Poço não encontrado: {poco}")
+
+    @app.get('/pocos/{poco}/eur')
+    async def eur(poco: str, q_limite: float = Query(50.0, gt=0), horizonte_meses: int = Query(600, gt=0, le=1200)):
+        return resposta_json(obter_estado().eur_json(poco, q_limite, horizonte_meses), f"Poço não encontrado: {poco}")
+
+    @app.get('/geo/localizar')
+    async def localizar(lat: float = Query(..., ge=-90, le=90), lon: float = Query(..., ge=-180, le=180)):
+        # Arredondar (~10 cm) melhora a taxa de acerto do cache sem alterar o resultado
+        return resposta_json(obter_estado().localizar_json(round(lat, 6), round(lon, 6)), None)
+
+    @app.post('/lote/previsao')
+    def lote_previsao(corpo: LotePrevisao):
+        return obter_estado().previsao_lote(corpo.ids, meses=corpo.meses, inicio=corpo.inicio)
+
+    @app.post('/lote/eur')
+    def lote_eur(corpo: LoteEUR):
+        return obter_estado().eur_lote(corpo.ids, q_limite=corpo.q_limite, horizonte_meses=corpo.horizonte_meses)
+
+    @app.post('/lote/geo/localizar')
+    def lote_localizar(corpo: LoteLocalizacao):
+        if len(corpo.lats) != len(corpo.lons):
+            raise HTTPException(status_code=422, detail="'lats' e 'lons' devem ter o mesmo tamanho.")
+        return {'resultados': obter_estado().localizar_lote(corpo.lats, corpo.lons)}
+
+    @app.get('/cache/estatisticas')
+    async def estatisticas_cache():
+        return obter_estado().estatisticas_cache()
+
+    return app
+
+
+def main(argv=None):
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Serviço HTTP local de previsões e consultas geográficas.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--porta', type=int, default=8000)
+    args = parser.parse_args(argv)
+
+    uvicorn.run(criar_app(), host=args.host, port=args.porta, log_level='warning')
+
+
+if __name__ == "__main__":
+    main()
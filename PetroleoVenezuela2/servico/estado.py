@@ -0,0 +1,175 @@
+import json
+import os
+from functools import lru_cache
+
+import numpy as np
+
+RAIZ_PROJETO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class EstadoServico:
+    """
+    Estado em memória do serviço de consultas: parâmetros de Arps ajustados
+    (como arrays, para consultas vetorizadas em lote) e camadas geográficas
+    indexadas em uma STRtree para localização ponto -> campo/bloco.
+
+    As previsões começam, por padrão, no fim do histórico de cada poço
+    (meses_historico: mapeamento poço -> número de meses de histórico).
+
+    As respostas das consultas unitárias mais frequentes passam por um cache
+    LRU que guarda o JSON já serializado.
+    """
+
+    def __init__(self, ajustes, camadas, meses_historico, tamanho_cache=4096):
+        # Apenas ajustes bem-sucedidos entram no índice
+        validos = {poco: p for poco, p in ajustes.items() if p.get('success')}
+        self.ids = list(validos)
+        self.indice = {poco: i for i, poco in enumerate(self.ids)}
+        self.parametros = validos
+        self.qi = np.array([validos[p]['qi'] for p in self.ids], dtype=float)
+        self.di = np.array([validos[p]['di_mensal'] for p in self.ids], dtype=float)
+        self.b = np.array([validos[p]['b'] for p in self.ids], dtype=float)
+        self.meses_historico = np.array([int(meses_historico[p]) for p in self.ids], dtype=int)
+
+        self._montar_indice_geo(camadas)
+
+        # Cache LRU por instância (evita manter estados antigos vivos em um cache global)
+        self.parametros_json = lru_cache(maxsize=tamanho_cache)(self._parametros_json)
+        self.previsao_json = lru_cache(maxsize=tamanho_cache)(self._previsao_json)
+        self.eur_json = lru_cache(maxsize=tamanho_cache)(self._eur_json)
+        self.localizar_json = lru_cache(maxsize=tamanho_cache)(self._localizar_json)
+
+    @classmethod
+    def do_pipeline(cls, diretorio_cache=None, tamanho_cache=4096):
+        """
+        Carrega histórico, ajustes e camadas reaproveitando o cache do pipeline (DAG):
+        se o CLI já rodou, nenhum ajuste é refeito na inicialização do serviço.
+        """
+        from pipeline.dag import PipelineDAG
+        from pipeline.etapas import construir_pipeline
+
+        if diretorio_cache is None:
+            diretorio_cache = os.path.join(RAIZ_PROJETO, '.cache_pipeline')
+        dag = PipelineDAG(diretorio_cache=diretorio_cache, paralelo=False)
+        construir_pipeline(dag, os.path.join(RAIZ_PROJETO, 'visualizacao'))
+        resultados = dag.executar(['carregar', 'ajustar', 'geo'])
+        # Meses de histórico por poço, como em etapa_prever
+        meses_historico = resultados['carregar'].groupby('campo').size()
+        return cls(resultados['ajustar'], resultados['geo'], meses_historico, tamanho_cache=tamanho_cache)
+
+    def _montar_indice_geo(self, camadas):
+        """
+        Agrupa campos, blocos e bacias em uma única STRtree.
+        Campos e blocos têm prioridade sobre a bacia que os contém.
+        """
+        from shapely import STRtree
+
+        geometrias, nomes, tipos = [], [], []
+        for chave, tipo in (('campos_maracaibo', 'campo'), ('orinoco', 'bloco'), ('bacia_maracaibo', 'bacia')):
+            gdf = camadas[chave].to_crs("EPSG:4326")
+            geometrias.extend(gdf.geometry.values)
+            nomes.extend(gdf['nome'].tolist())
+            tipos.extend([tipo] * len(gdf))
+        self.geo_nomes = nomes
+        self.geo_tipos = tipos
+        self.arvore_geo = STRtree(geometrias)
+
+    # ------------------------------------------------------------------
+    # Consultas vetorizadas (lote)
+    # ------------------------------------------------------------------
+
+    def _resolver_ids(self, ids):
+        posicoes, encontrados, ausentes = [], [], []
+        for poco in ids:
+            i = self.indice.get(poco)
+            if i is None:
+                ausentes.append(poco)
+            else:
+                posicoes.append(i)
+                encontrados.append(poco)
+        return np.array(posicoes, dtype=int), encontrados, ausentes
+
+    def previsao_lote(self, ids, meses=60, inicio=None):
+        """
+        Vazões mensais de cada poço a partir do mês `inicio` (contado do início
+        do histórico). Se inicio for None, cada poço começa no fim do seu histórico.
+        """
+        from analise.engenharia_reservatorios import DeclineCurveAnalyzer
+
+        pos, encontrados, ausentes = self._resolver_ids(ids)
+        inicios = self.meses_historico[pos] if inicio is None else np.full(len(pos), inicio)
+        t = inicios[:, None] + np.arange(meses)[None, :]
+        matriz = DeclineCurveAnalyzer.arps_vetorizado(t, self.qi[pos], self.di[pos], self.b[pos])
+        return {
+            'inicio': dict(zip(encontrados, inicios.tolist())),
+            'meses': meses,
+            'previsoes': {poco: linha for poco, linha in zip(encontrados, np.round(matriz, 2).tolist())},
+            'nao_encontrados': ausentes,
+        }
+
+    def eur_lote(self, ids, q_limite=50.0, horizonte_meses=600):
+        from analise.engenharia_reservatorios import DeclineCurveAnalyzer
+
+        pos, encontrados, ausentes = self._resolver_ids(ids)
+        eur = DeclineCurveAnalyzer.calcular_eur(self.qi[pos], self.di[pos], self.b[pos],
+                                                q_limite=q_limite, horizonte_meses=horizonte_meses)
+        return {
+            'q_limite': q_limite,
+            'horizonte_meses': horizonte_meses,
+            'eur_bbl': dict(zip(encontrados, np.round(eur, 1).tolist())),
+            'nao_encontrados': ausentes,
+        }
+
+    def localizar_lote(self, lats, lons):
+        """
+        Localiza cada ponto (lat, lon) no campo/bloco e na bacia que o contêm.
+        """
+        import shapely
+
+        pontos = shapely.points(np.asarray(lons, dtype=float), np.asarray(lats, dtype=float))
+        idx_pontos, idx_geo = self.arvore_geo.query(pontos, predicate='within')
+
+        resultado = [{'campo_ou_bloco': None, 'tipo': None, 'bacia': None} for _ in range(len(pontos))]
+        for i, g in zip(idx_pontos.tolist(), idx_geo.tolist()):
+            tipo = self.geo_tipos[g]
+            if tipo == 'bacia':
+                resultado[i]['bacia'] = self.geo_nomes[g]
+            elif resultado[i]['campo_ou_bloco'] is None:
+                resultado[i]['campo_ou_bloco'] = self.geo_nomes[g]
+                resultado[i]['tipo'] = tipo
+        return resultado
+
+    # ------------------------------------------------------------------
+    # Consultas unitárias (passam pelo cache LRU de respostas)
+    # ------------------------------------------------------------------
+
+    def _parametros_json(self, poco):
+        params = self.parametros.get(poco)
+        if params is None:
+            return None
+        corpo = {'poco': poco}
+        corpo.update({k: v if isinstance(v, bool) else float(v) for k, v in params.items()})
+        return json.dumps(corpo).encode()
+
+    def _previsao_json(self, poco, meses, inicio):
+        if poco not in self.indice:
+            return None
+        lote = self.previsao_lote([poco], meses=meses, inicio=inicio)
+        return json.dumps({'poco': poco, 'inicio': lote['inicio'][poco], 'vazao_bpd': lote['previsoes'][poco]}).encode()
+
+    def _eur_json(self, poco, q_limite, horizonte_meses):
+        if poco not in self.indice:
+            return None
+        lote = self.eur_lote([poco], q_limite=q_limite, horizonte_meses=horizonte_meses)
+        return json.dumps({'poco': poco, 'q_limite': q_limite, 'eur_bbl': lote['eur_bbl'][poco]}).encode()
+
+    def _localizar_json(self, lat, lon):
+        corpo = {'lat': lat, 'lon': lon}
+        corpo.update(self.localizar_lote([lat], [lon])[0])
+        return json.dumps(corpo).encode()
+
+    def estatisticas_cache(self):
+        return {
+            nome: getattr(self, nome).cache_info()._asdict()
+            for nome in ('parametros_json', 'previsao_json', 'eur_json', 'localizar_json')
+        }
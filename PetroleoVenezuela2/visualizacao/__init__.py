@@ -0,0 +1,12 @@
+"""Geração de mapas interativos, modelos 3D, gráficos e grades agregadas."""
+from exportacao_tardia import exportar_sob_demanda
+
+_EXPORTS = {
+    'gerar_mapa_avancado': 'mapa_interativo',
+    'gerar_visualizacao_3d_maracaibo': 'vis_3d_bacia',
+    'RenderizadorDCA': 'dca_lote',
+    'renderizar_lote': 'dca_lote',
+    'PiramideAgregada': 'agregados',
+}
+
+__getattr__, __dir__, __all__ = exportar_sob_demanda(__name__, _EXPORTS)
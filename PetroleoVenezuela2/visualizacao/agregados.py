@@ -0,0 +1,189 @@
+import math
+
+import numpy as np
+
+# Extensão padrão das grades: território venezuelano com folga (lon_min, lat_min, lon_max, lat_max)
+LIMITES_VENEZUELA = (-74.0, 0.5, -59.0, 12.5)
+
+
+class PiramideAgregada:
+    """
+    Grade agregada em múltiplas resoluções (pirâmide quadrada, fator 2 por nível).
+
+    O nível 0 é a grade base (resolucao_base x resolucao_base células); cada
+    nível seguinte agrega blocos 2x2 do anterior (soma para volumes, média
+    para superfícies). As grades são float32 de tamanho fixo: a memória e o
+    tamanho das saídas dependem só da resolução, nunca da quantidade de dados
+    de entrada, que pode ser acumulada em pedaços (streaming) via acumular().
+    """
+
+    def __init__(self, limites=LIMITES_VENEZUELA, resolucao_base=256, agregacao='soma', resolucao_minima=4):
+        if resolucao_base & (resolucao_base - 1):
+            raise ValueError("resolucao_base deve ser potência de 2.")
+        if agregacao not in ('soma', 'media'):
+            raise ValueError("agregacao deve ser 'soma' ou 'media'.")
+        self.limites = tuple(float(v) for v in limites)
+        self.resolucao_base = resolucao_base
+        self.agregacao = agregacao
+        self.resolucao_minima = resolucao_minima
+        self.base = np.zeros((resolucao_base, resolucao_base), dtype=np.float32)
+        self.niveis = None
+
+    def __getstate__(self):
+        # Os níveis derivados não são serializados (ex: cache do pipeline); são refeitos sob demanda
+        estado = self.__dict__.copy()
+        estado['niveis'] = None
+        return estado
+
+    # ------------------------------------------------------------------
+    # Acumulação
+    # ------------------------------------------------------------------
+
+    def _indices_celulas(self, lons, lats):
+        lon_min, lat_min, lon_max, lat_max = self.limites
+        n = self.resolucao_base
+        ix = np.floor((np.asarray(lons, dtype=float) - lon_min) / (lon_max - lon_min) * n).astype(np.int64)
+        iy = np.floor((np.asarray(lats, dtype=float) - lat_min) / (lat_max - lat_min) * n).astype(np.int64)
+        dentro = (ix >= 0) & (ix < n) & (iy >= 0) & (iy < n)
+        return iy[dentro] * n + ix[dentro], dentro
+
+    def acumular(self, lons, lats, pesos=None):
+        """
+        Soma os pesos dos pontos nas células da grade base. Pode ser chamada
+        repetidamente com pedaços dos dados; pontos fora dos limites são ignorados.
+        """
+        celulas, dentro = self._indices_celulas(lons, lats)
+        pesos = np.ones(len(dentro)) if pesos is None else np.asarray(pesos, dtype=float)
+        n = self.resolucao_base
+        self.base += np.bincount(celulas, weights=pesos[dentro], minlength=n * n).reshape(n, n).astype(np.float32)
+        self.niveis = None
+        return self
+
+    def acumular_poligonos(self, geometrias, valores):
+        """
+        Distribui o valor de cada polígono (ex: reservas) igualmente entre as
+        células da grade base cujo centro está dentro dele.
+        """
+        import shapely
+
+        lats, lons = self.centros_celulas(0)
+        grade_lon, grade_lat = np.meshgrid(lons, lats)
+        for geometria, valor in zip(geometrias, valores):
+            dentro = shapely.contains_xy(geometria, grade_lon, grade_lat)
+            if dentro.any():
+                self.base[dentro] += np.float32(valor / dentro.sum())
+        self.niveis = None
+        return self
+
+    @classmethod
+    def de_grade(cls, grade, limites, agregacao='media', resolucao_minima=4):
+        """
+        Cria a pirâmide a partir de uma grade já calculada (ex: superfície de profundidade).
+        """
+        grade = np.asarray(grade, dtype=np.float32)
+        if grade.shape[0] != grade.shape[1]:
+            raise ValueError("A grade deve ser quadrada.")
+        piramide = cls(limites, resolucao_base=grade.shape[0], agregacao=agregacao, resolucao_minima=resolucao_minima)
+        piramide.base = grade.copy()
+        return piramide
+
+    # ------------------------------------------------------------------
+    # Níveis
+    # ------------------------------------------------------------------
+
+    def construir_niveis(self):
+        niveis = [self.base]
+        while niveis[-1].shape[0] // 2 >= self.resolucao_minima:
+            atual = niveis[-1]
+            n = atual.shape[0] // 2
+            blocos = atual.reshape(n, 2, n, 2)
+            niveis.append(blocos.sum(axis=(1, 3)) if self.agregacao == 'soma' else blocos.mean(axis=(1, 3)))
+        self.niveis = niveis
+        return niveis
+
+    def nivel(self, indice):
+        if self.niveis is None:
+            self.construir_niveis()
+        return self.niveis[indice]
+
+    def nivel_por_lado(self, max_lado):
+        """
+        Índice do nível mais detalhado cuja grade tem no máximo max_lado células por lado.
+        """
+        if self.niveis is None:
+            self.construir_niveis()
+        for indice, grade in enumerate(self.niveis):
+            if grade.shape[0] <= max_lado:
+                return indice
+        return len(self.niveis) - 1
+
+    def centros_celulas(self, indice):
+        """
+        Coordenadas (lats, lons) dos centros das células de um nível.
+        """
+        lon_min, lat_min, lon_max, lat_max = self.limites
+        n = self.resolucao_base >> indice
+        lons = lon_min + (np.arange(n) + 0.5) * (lon_max - lon_min) / n
+        lats = lat_min + (np.arange(n) + 0.5) * (lat_max - lat_min) / n
+        return lats, lons
+
+    def celulas(self, indice):
+        """
+        Células não vazias de um nível como arrays (lats, lons, valores):
+        formato esparso para embutir em mapas.
+        """
+        grade = self.nivel(indice)
+        iy, ix = np.nonzero(grade)
+        lats, lons = self.centros_celulas(indice)
+        return lats[iy], lons[ix], grade[iy, ix]
+
+    def faixas_zoom(self, zoom_min=4, zoom_max=12, pixels_por_celula=12, max_celulas=20000):
+        """
+        Associa cada nível a uma faixa de zoom do mapa (tiles web de 256 px):
+        em cada zoom usa-se o nível cuja célula ocupa ~pixels_por_celula na tela.
+        Níveis com mais de max_celulas células não vazias não são usados.
+        Retorna lista de (nivel, zoom_inicial, zoom_final).
+        """
+        if self.niveis is None:
+            self.construir_niveis()
+        largura_graus = self.limites[2] - self.limites[0]
+
+        permitido = 0
+        while permitido < len(self.niveis) - 1 and np.count_nonzero(self.niveis[permitido]) > max_celulas:
+            permitido += 1
+
+        faixas = []
+        for zoom in range(zoom_min, zoom_max + 1):
+            pixels_por_grau = 256 * 2 ** zoom / 360.0
+            # Número de células por lado que deixa cada célula com ~pixels_por_celula
+            lado_ideal = largura_graus * pixels_por_grau / pixels_por_celula
+            indice = int(np.clip(round(math.log2(self.resolucao_base / max(lado_ideal, 1))), permitido,
+                                 len(self.niveis) - 1))
+            if faixas and faixas[-1][0] == indice:
+                faixas[-1] = (indice, faixas[-1][1], zoom)
+            else:
+                faixas.append((indice, zoom, zoom))
+        return faixas
+
+    # ------------------------------------------------------------------
+    # Persistência
+    # ------------------------------------------------------------------
+
+    def salvar(self, caminho):
+        """
+        Salva a grade base (float32, comprimida) e os metadados em .npz.
+        Os níveis são recalculados na leitura (custo desprezível).
+        """
+        np.savez_compressed(
+            caminho, base=self.base, limites=np.array(self.limites),
+            agregacao=np.array(self.agregacao), resolucao_minima=np.array(self.resolucao_minima)
+        )
+        return caminho
+
+    @classmethod
+    def carregar(cls, caminho):
+        with np.load(caminho) as dados:
+            piramide = cls(tuple(dados['limites']), resolucao_base=dados['base'].shape[0],
+                           agregacao=str(dados['agregacao']), resolucao_minima=int(dados['resolucao_minima']))
+            piramide.base = dados['base'].astype(np.float32)
+        return piramide
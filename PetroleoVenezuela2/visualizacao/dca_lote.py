@@ -0,0 +1,250 @@
+import argparse
+import math
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# Renderizador reaproveitado por processo (criado sob demanda em cada trabalhador)
+_RENDERIZADOR = None
+
+
+def _slug(nome):
+    return re.sub(r'[^a-z0-9]+', '_', str(nome).lower()).strip('_')
+
+
+class RenderizadorDCA:
+    """
+    Figura DCA única (backend Agg) reaproveitada para muitos poços.
+    Os artistas (pontos do histórico, curva ajustada e previsão) são criados
+    uma vez; a cada poço apenas seus dados, limites e título são atualizados,
+    evitando reconstruir figura, eixos e legenda.
+    """
+
+    def __init__(self, largura=10, altura=6, dpi=100):
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        import matplotlib.dates as mdates
+
+        self.mdates = mdates
+        self.fig = Figure(figsize=(largura, altura), dpi=dpi)
+        FigureCanvasAgg(self.fig)
+        self.ax = self.fig.add_subplot(111)
+
+        self.historico = self.ax.scatter([], [], alpha=0.5, color='gray', label='Histórico Real', s=10)
+        (self.linha_ajuste,) = self.ax.plot([], [], color='blue', linewidth=2, label='Ajuste DCA')
+        (self.linha_previsao,) = self.ax.plot([], [], color='green', linestyle='--', linewidth=2, label='Previsão')
+
+        localizador = mdates.AutoDateLocator()
+        self.ax.xaxis.set_major_locator(localizador)
+        self.ax.xaxis.set_major_formatter(mdates.ConciseDateFormatter(localizador))
+        self.ax.set_xlabel("Data")
+        self.ax.set_ylabel("Produção (bbl/dia)")
+        self.ax.legend(loc='upper right')
+        self.ax.grid(True, alpha=0.3)
+
+    def renderizar(self, titulo, datas, y_prod, ajuste, datas_futuras, previsao, caminho):
+        x_hist = self.mdates.date2num(datas)
+        x_fut = self.mdates.date2num(datas_futuras)
+
+        self.historico.set_offsets(np.column_stack([x_hist, y_prod]))
+        self.linha_ajuste.set_data(x_hist, ajuste)
+        self.linha_previsao.set_data(x_fut, previsao)
+
+        # relim() ignora coleções (scatter): os limites são calculados diretamente
+        x_fim = x_fut[-1] if len(x_fut) else x_hist[-1]
+        self.ax.set_xlim(x_hist[0], x_fim)
+        y_max = max(np.max(y_prod), np.max(ajuste))
+        self.ax.set_ylim(0, y_max * 1.05 if y_max > 0 else 1)
+        self.ax.set_title(titulo)
+
+        # Compressão PNG rápida: o custo de codificação cai sem perda de qualidade
+        self.fig.savefig(caminho, pil_kwargs={'compress_level': 1})
+        return caminho
+
+
+def _obter_renderizador():
+    global _RENDERIZADOR
+    if _RENDERIZADOR is None:
+        _RENDERIZADOR = RenderizadorDCA()
+    return _RENDERIZADOR
+
+
+def _processar_pacote(pacote, diretorio_saida, meses_previsao):
+    """
+    Executado em cada processo trabalhador: ajusta e prevê (se necessário) e
+    renderiza um pacote de poços reaproveitando a mesma figura.
+    """
+    import pandas as pd
+    from analise.engenharia_reservatorios import DeclineCurveAnalyzer
+
+    analyzer = DeclineCurveAnalyzer()
+    renderizador = _obter_renderizador()
+    saidas = []
+    for poco, datas, y_prod, params, previsao in pacote:
+        if params is None:
+            params = analyzer.fit_decline_curve(datas, y_prod)
+        if not params.get('success'):
+            saidas.append((poco, None, params))
+            continue
+
+        len_hist = len(y_prod)
+        ajuste = analyzer.forecast_from_parameters(params, 0, len_hist)
+        if previsao is None:
+            previsao = analyzer.forecast_from_parameters(params, len_hist, meses_previsao)
+        datas_futuras = pd.date_range(start=pd.Timestamp(datas[-1]) + pd.Timedelta(days=1),
+                                      periods=len(previsao), freq='ME').values
+
+        caminho = os.path.join(diretorio_saida, f"dca_{_slug(poco)}.png")
+        renderizador.renderizar(f"Análise de Declínio de Produção - {poco}",
+                                datas, y_prod, ajuste, datas_futuras, previsao, caminho)
+        saidas.append((poco, caminho, params))
+    return saidas
+
+
+def montar_tarefas(df_prod, coluna_id='campo', ajustes=None, previsoes=None):
+    """
+    Agrupa o histórico por poço/campo em uma única passada (groupby),
+    em vez de filtrar o DataFrame inteiro para cada poço.
+    Ajustes e previsões já calculados (ex: pelo pipeline) são reaproveitados;
+    os ausentes são calculados no trabalhador.
+    """
+    ajustes = ajustes or {}
+    previsoes = previsoes or {}
+    tarefas = []
+    for poco, df_poco in df_prod.sort_values([coluna_id, 'data']).groupby(coluna_id, sort=False):
+        tarefas.append((poco, df_poco['data'].values, df_poco['producao_bpd'].values,
+                        ajustes.get(poco), previsoes.get(poco)))
+    return tarefas
+
+
+def renderizar_lote(tarefas, diretorio_saida, meses_previsao=60, workers=None):
+    """
+    Renderiza um gráfico DCA por poço. Com workers > 1, os poços são divididos
+    em pacotes processados em paralelo, cada processo com sua própria figura.
+    Retorna (caminhos, ajustes).
+    """
+    os.makedirs(diretorio_saida, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1 or len(tarefas) <= 1:
+        resultados = _processar_pacote(tarefas, diretorio_saida, meses_previsao)
+    else:
+        # Pacotes pequenos o bastante para balancear carga, grandes o bastante para amortizar o IPC
+        tamanho = max(1, math.ceil(len(tarefas) / (workers * 4)))
+        pacotes = [tarefas[i:i + tamanho] for i in range(0, len(tarefas), tamanho)]
+        resultados = []
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for parcial in executor.map(_processar_pacote, pacotes,
+                                        [diretorio_saida] * len(pacotes), [meses_previsao] * len(pacotes)):
+                resultados.extend(parcial)
+
+    caminhos = [caminho for _, caminho, _ in resultados if caminho is not None]
+    ajustes = {poco: params for poco, _, params in resultados}
+    return caminhos, ajustes
+
+
+def gerar_folha_contato(caminhos, output_path, colunas=10, largura_miniatura=250, max_miniaturas=1000):
+    """
+    Monta uma folha de contato (mosaico de miniaturas) a partir dos PNGs gerados.
+    As miniaturas são reduzidas por amostragem (stride), em uint8, para manter a memória baixa.
+    """
+    import matplotlib.image as mpimg
+
+    caminhos = list(caminhos)[:max_miniaturas]
+    if not caminhos:
+        return None
+
+    primeira = mpimg.imread(caminhos[0])
+    passo = max(1, primeira.shape[1] // largura_miniatura)
+    alt, larg = primeira[::passo, ::passo, :3].shape[:2]
+
+    linhas = math.ceil(len(caminhos) / colunas)
+    folha = np.full((linhas * alt, colunas * larg, 3), 255, dtype=np.uint8)
+    for i, caminho in enumerate(caminhos):
+        miniatura = mpimg.imread(caminho)[::passo, ::passo, :3][:alt, :larg]
+        if miniatura.dtype != np.uint8:
+            miniatura = (miniatura * 255).astype(np.uint8)
+        lin, col = divmod(i, colunas)
+        folha[lin * alt:lin * alt + miniatura.shape[0], col * larg:col * larg + miniatura.shape[1]] = miniatura
+
+    mpimg.imsave(output_path, folha)
+    return output_path
+
+
+def gerar_densidade_normalizada(df_prod, ajustes, output_path, coluna_id='campo', bins_y=150, y_max=1.5):
+    """
+    Gráfico de densidade agregada de todas as curvas normalizadas (q/qi x meses).
+    Em vez de desenhar milhares de linhas, os pontos são acumulados em um
+    histograma 2D (estilo datashader) e exibidos em escala logarítmica.
+    """
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.colors import LogNorm
+
+    qi = {poco: p['qi'] for poco, p in ajustes.items() if p.get('success') and p['qi'] > 0}
+    df = df_prod[df_prod[coluna_id].isin(qi.keys())].sort_values([coluna_id, 'data'])
+    if df.empty:
+        return None
+
+    meses = df.groupby(coluna_id, sort=False).cumcount().values
+    normalizada = df['producao_bpd'].values / df[coluna_id].map(qi).values
+
+    # Um bin por mês no eixo do tempo (a série é mensal)
+    n_meses = int(meses.max()) + 1
+    densidade, borda_x, borda_y = np.histogram2d(
+        meses, normalizada, bins=(n_meses, bins_y), range=[[0, n_meses], [0, y_max]]
+    )
+
+    fig = Figure(figsize=(10, 6), dpi=100)
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot(111)
+    imagem = ax.imshow(
+        np.ma.masked_equal(densidade.T, 0), origin='lower', aspect='auto', cmap='viridis',
+        norm=LogNorm(), extent=[borda_x[0], borda_x[-1], borda_y[0], borda_y[-1]]
+    )
+    fig.colorbar(imagem, ax=ax, label='Número de observações')
+    ax.set_title(f"Curvas de Declínio Normalizadas ({len(qi)} poços)")
+    ax.set_xlabel("Meses desde o início do histórico")
+    ax.set_ylabel("q / qi")
+    fig.savefig(output_path)
+    return output_path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Renderização em lote de gráficos DCA (backend Agg).")
+    parser.add_argument('--saida', default=os.path.join(os.path.dirname(os.path.abspath(__file__)), 'dca_lote'))
+    parser.add_argument('--sintetico', type=int, default=0,
+                        help="Gera um portfólio sintético com N poços em vez dos campos padrão.")
+    parser.add_argument('--workers', type=int, default=None, help="Processos de renderização.")
+    parser.add_argument('--meses', type=int, default=60, help="Horizonte da previsão em meses.")
+    parser.add_argument('--folha-contato', action='store_true', help="Gera o mosaico de miniaturas.")
+    parser.add_argument('--densidade', action='store_true', help="Gera o gráfico de densidade agregada.")
+    args = parser.parse_args(argv)
+
+    if args.sintetico:
+        from dados.simulacao import SimuladorProducao
+        df_prod = SimuladorProducao().simular_portfolio(args.sintetico)
+        coluna_id = 'poco'
+    else:
+        from dados.ingestao import OpecDataLoader
+        df_prod = OpecDataLoader().carregar_producao_mensal()
+        coluna_id = 'campo'
+
+    inicio = time.perf_counter()
+    caminhos, ajustes = renderizar_lote(montar_tarefas(df_prod, coluna_id), args.saida,
+                                        meses_previsao=args.meses, workers=args.workers)
+    print(f"{len(caminhos)} gráficos DCA gerados em {time.perf_counter() - inicio:.1f}s: {args.saida}")
+
+    if args.folha_contato:
+        print(f"Folha de contato: {gerar_folha_contato(caminhos, os.path.join(args.saida, 'folha_contato.png'))}")
+    if args.densidade:
+        caminho = gerar_densidade_normalizada(df_prod, ajustes, os.path.join(args.saida, 'densidade_normalizada.png'),
+                                              coluna_id=coluna_id)
+        print(f"Densidade agregada: {caminho}")
+
+
+if __name__ == "__main__":
+    main()
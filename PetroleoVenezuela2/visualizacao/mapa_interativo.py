@@ -1,18 +1,120 @@
-import folium
-import geopandas as gpd
 import sys
 import os
+import numpy as np
 
 # Adicionar diretório raiz
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from geografia.camadas_geo import criar_bacia_maracaibo_detalhada, criar_faja_orinoco_blocos, criar_infraestrutura_avancada
-from dados.gerenciador_dados import GerenciadorDadosPetroleo
+def _adicionar_piramide(mapa, piramide, nome, show=True, gradiente=None):
+    """
+    Adiciona uma PiramideAgregada como camada de calor multi-resolução.
+    Cada faixa de zoom recebe um HeatMap com as células não vazias do nível
+    correspondente (pesos normalizados); o HTML guarda só esses níveis, nunca
+    os pontos brutos. Retorna (grupo, [(heatmap, zoom_inicial, zoom_final)]).
+    """
+    import folium
+    from folium.plugins import HeatMap
+
+    grupo = folium.FeatureGroup(name=nome, show=show)
+    faixas = []
+    for nivel, zoom_inicial, zoom_final in piramide.faixas_zoom():
+        lats, lons, valores = piramide.celulas(nivel)
+        if len(valores) == 0:
+            continue
+        pesos = valores / valores.max()
+        dados = np.column_stack([lats, lons, pesos]).round(4).tolist()
+        camada = HeatMap(dados, radius=15, blur=10, max_zoom=zoom_final, gradient=gradiente)
+        camada.add_to(grupo)
+        faixas.append((camada, zoom_inicial, zoom_final))
+    grupo.add_to(mapa)
+    return grupo, faixas
+
+def _script_troca_por_zoom(mapa, grupos):
+    """
+    JavaScript que mantém em cada grupo apenas o HeatMap da faixa do zoom atual.
+    Executado no evento 'load', depois que todas as camadas foram criadas.
+    """
+    entradas = []
+    zooms = []
+    for grupo, faixas in grupos:
+        for camada, zoom_inicial, zoom_final in faixas:
+            entradas.append(f"[{grupo.get_name()}, {camada.get_name()}, {zoom_inicial}, {zoom_final}]")
+            zooms += [zoom_inicial, zoom_final]
+    if not entradas:
+        return ''
+    # Fora do intervalo coberto, vale a faixa mais próxima (zoom limitado ao intervalo)
+    return '''
+    <script>
+    window.addEventListener('load', function() {
+        var mapa = %s;
+        var faixas = [%s];
+        function atualizar() {
+            var z = Math.min(Math.max(mapa.getZoom(), %d), %d);
+            faixas.forEach(function(f) {
+                var visivel = z >= f[2] && z <= f[3];
+                if (visivel && !f[0].hasLayer(f[1])) { f[0].addLayer(f[1]); }
+                if (!visivel && f[0].hasLayer(f[1])) { f[0].removeLayer(f[1]); }
+            });
+        }
+        mapa.on('zoomend', atualizar);
+        atualizar();
+    });
+    </script>
+    ''' % (mapa.get_name(), ', '.join(entradas), min(zooms), max(zooms))
+
+def _adicionar_flaring_bruto(mapa):
+    """
+    Mapa de calor de flaring a partir dos pontos brutos do satélite (mock).
+    """
+    import folium
+    from folium.plugins import HeatMap
+    from dados.gerenciador_dados import GerenciadorDadosPetroleo
+
+    gerenciador = GerenciadorDadosPetroleo()
+    df_satelite = gerenciador.integracao_satelite_mock()
+    
+    heatmap_group = folium.FeatureGroup(name="Monitoramento Satélite (Análise de Flaring)")
+    
+    # Converter para lista de [lat, lon, peso]
+    heat_data = [[row['lat'], row['lon'], 1.0 if row['intensidade']=='Alta' else 0.5] for _, row in df_satelite.iterrows()]
+    
+    HeatMap(heat_data, radius=15, blur=10, max_zoom=10).add_to(heatmap_group)
+    
+    _adicionar_focos_flaring(heatmap_group, df_satelite)
+    heatmap_group.add_to(mapa)
+
+def _adicionar_focos_flaring(grupo, df_satelite):
+    """
+    Círculos individuais (clicáveis) para cada foco de calor detectado.
+    """
+    import folium
+
+    for _, row in df_satelite.iterrows():
+        folium.CircleMarker(
+            location=[row['lat'], row['lon']],
+            radius=5,
+            color='yellow',
+            fill=True,
+            fill_opacity=0.5,
+            popup=f"Fonte de Calor Detectada ({row['intensidade']})"
+        ).add_to(grupo)
 
-def gerar_mapa_avancado():
+def gerar_mapa_avancado(camadas=None, output_path=None, densidade=None, agregados=None):
     """
     Gera um mapa profissional e detalhado da indústria petrolífera venezuelana.
+    camadas: dicionário opcional com as camadas geográficas já carregadas
+             (ex: produzido pelo pipeline); se None, são recriadas aqui.
+    densidade: GeoDataFrame opcional de densidade de poços por polígono
+               (AnaliseEspacamento.densidade_por_poligono), exibido como camada.
+    agregados: dicionário opcional de PiramideAgregada ('flaring', 'producao',
+               'reservas'); quando presente, os mapas de calor embutem apenas
+               as grades agregadas do nível de cada zoom, em vez dos pontos brutos.
+               'focos_flaring' (DataFrame limitado de detecções) mantém os
+               focos clicáveis.
     """
+    # Importações pesadas (folium, geopandas) adiadas até a geração do mapa
+    import folium
+
     print("Gerando mapa interativo avançado...")
     
     # 1. Configuração do Mapa Base
@@ -30,9 +132,17 @@ def gerar_mapa_avancado():
     mapa.get_root().html.add_child(folium.Element(title_html))
 
     # 2. Carregar Dados Detalhados
-    gdf_bacia_maracaibo, gdf_campos_maracaibo = criar_bacia_maracaibo_detalhada()
-    gdf_orinoco = criar_faja_orinoco_blocos()
-    gdf_infra, gdf_dutos = criar_infraestrutura_avancada()
+    if camadas is None:
+        from geografia.camadas_geo import criar_bacia_maracaibo_detalhada, criar_faja_orinoco_blocos, criar_infraestrutura_avancada
+        gdf_bacia_maracaibo, gdf_campos_maracaibo = criar_bacia_maracaibo_detalhada()
+        gdf_orinoco = criar_faja_orinoco_blocos()
+        gdf_infra, gdf_dutos = criar_infraestrutura_avancada()
+    else:
+        gdf_bacia_maracaibo = camadas['bacia_maracaibo']
+        gdf_campos_maracaibo = camadas['campos_maracaibo']
+        gdf_orinoco = camadas['orinoco']
+        gdf_infra = camadas['infra']
+        gdf_dutos = camadas['dutos']
     
     # 3. Estilização e Adição de Camadas
     
@@ -50,6 +160,13 @@ def gerar_mapa_avancado():
     ).add_to(mapa)
     
     # --- Campos de Maracaibo (Detalhe) ---
+    campos_fields = ['nome', 'tipo', 'reservas_estimadas_gb']
+    campos_aliases = ['Campo', 'Tipo', 'Reservas (Gb)']
+    # Parâmetros DCA juntados pelo pipeline (quando disponíveis)
+    if 'di_anual_nominal' in gdf_campos_maracaibo.columns:
+        campos_fields += ['qi', 'di_anual_nominal', 'b']
+        campos_aliases += ['qi (bpd)', 'Di anual', 'b (Arps)']
+
     folium.GeoJson(
         gdf_campos_maracaibo,
         name='Campos Costeiros Bolívar',
@@ -59,7 +176,7 @@ def gerar_mapa_avancado():
             'weight': 1,
             'fillOpacity': 0.7
         },
-        tooltip=folium.GeoJsonTooltip(fields=['nome', 'tipo', 'reservas_estimadas_gb'], aliases=['Campo', 'Tipo', 'Reservas (Gb)'])
+        tooltip=folium.GeoJsonTooltip(fields=campos_fields, aliases=campos_aliases)
     ).add_to(mapa)
 
     # --- Faixa do Orinoco (Blocos) ---
@@ -106,30 +223,50 @@ def gerar_mapa_avancado():
         tooltip=folium.GeoJsonTooltip(fields=['nome', 'tipo'])
     ).add_to(mapa)
 
-    # --- Satélite (Mock Flaring) ---
-    gerenciador = GerenciadorDadosPetroleo()
-    df_satelite = gerenciador.integracao_satelite_mock()
-    
-    heatmap_group = folium.FeatureGroup(name="Monitoramento Satélite (Análise de Flaring)")
-    from folium.plugins import HeatMap
-    
-    # Converter para lista de [lat, lon, peso]
-    heat_data = [[row['lat'], row['lon'], 1.0 if row['intensidade']=='Alta' else 0.5] for _, row in df_satelite.iterrows()]
-    
-    HeatMap(heat_data, radius=15, blur=10, max_zoom=10).add_to(heatmap_group)
-    
-    # Círculos individuais também para clique
-    for _, row in df_satelite.iterrows():
-        folium.CircleMarker(
-            location=[row['lat'], row['lon']],
-            radius=5,
-            color='yellow',
-            fill=True,
-            fill_opacity=0.5,
-            popup=f"Fonte de Calor Detectada ({row['intensidade']})"
-        ).add_to(heatmap_group)
-        
-    heatmap_group.add_to(mapa)
+    # --- Densidade de Poços (Análise de Espaçamento) ---
+    if densidade is not None:
+        import branca.colormap as cm
+
+        escala = cm.LinearColormap(
+            ['#ffffb2', '#fd8d3c', '#bd0026'],
+            vmin=float(densidade['densidade_pocos_km2'].min()),
+            vmax=float(densidade['densidade_pocos_km2'].max()),
+            caption='Densidade de poços (poços/km²)'
+        )
+        folium.GeoJson(
+            densidade,
+            name='Densidade de Poços',
+            show=False,
+            style_function=lambda feature: {
+                'fillColor': escala(feature['properties']['densidade_pocos_km2']),
+                'color': 'black',
+                'weight': 1,
+                'fillOpacity': 0.7
+            },
+            tooltip=folium.GeoJsonTooltip(
+                fields=['nome', 'n_pocos', 'densidade_pocos_km2', 'espacamento_medio_m'],
+                aliases=['Área', 'Poços', 'Poços/km²', 'Espaçamento médio (m)']
+            )
+        ).add_to(mapa)
+        escala.add_to(mapa)
+
+    # --- Satélite (Flaring) e Camadas Agregadas ---
+    if agregados is None:
+        # Sem agregados, os pontos brutos (poucos, no mock) são embutidos diretamente
+        _adicionar_flaring_bruto(mapa)
+    else:
+        # Apenas as grades pré-calculadas do nível de cada faixa de zoom vão para o HTML
+        grupos = [_adicionar_piramide(mapa, agregados['flaring'], "Monitoramento Satélite (Análise de Flaring)")]
+        if 'focos_flaring' in agregados:
+            # Focos clicáveis: lista já limitada pela etapa de agregação (mais intensos primeiro)
+            _adicionar_focos_flaring(grupos[0][0], agregados['focos_flaring'])
+        if 'producao' in agregados:
+            grupos.append(_adicionar_piramide(mapa, agregados['producao'], "Produção (bbl/dia)", show=False,
+                                              gradiente={0.4: 'blue', 0.65: 'lime', 1.0: 'white'}))
+        if 'reservas' in agregados:
+            grupos.append(_adicionar_piramide(mapa, agregados['reservas'], "Reservas Estimadas (Gb)", show=False,
+                                              gradiente={0.4: 'purple', 0.7: 'orange', 1.0: 'yellow'}))
+        mapa.get_root().html.add_child(folium.Element(_script_troca_por_zoom(mapa, grupos)))
 
     # Controles
     folium.LayerControl(collapsed=False).add_to(mapa)
@@ -154,9 +291,11 @@ def gerar_mapa_avancado():
     mapa.get_root().html.add_child(folium.Element(legend_html))
 
     # Salvar
-    output_path = os.path.join(os.path.dirname(__file__), 'mapa_venezuela_avancado.html')
+    if output_path is None:
+        output_path = os.path.join(os.path.dirname(__file__), 'mapa_venezuela_avancado.html')
     mapa.save(output_path)
     print(f"Mapa Avançado salvo em: {output_path}")
+    return output_path
 
 if __name__ == "__main__":
     gerar_mapa_avancado()
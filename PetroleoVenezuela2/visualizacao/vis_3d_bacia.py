@@ -1,44 +1,73 @@
-import plotly.graph_objects as go
 import numpy as np
-import pandas as pd
-import geopandas as gpd
 import sys
 import os
 
 # Importar módulos locais
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from geografia.camadas_geo import criar_bacia_maracaibo_detalhada
 
-def gerar_visualizacao_3d_maracaibo():
+# Intervalo de coordenadas da bacia (simplificado): (lon_min, lat_min, lon_max, lat_max)
+LIMITES_BACIA = (-73.0, 9.0, -70.0, 12.0)
+CENTRO_BACIA = (-71.5, 10.5)
+
+def profundidade_embasamento(lon, lat):
+    """
+    Profundidade simulada do embasamento (m, negativa).
+    A bacia é mais profunda no centro e rasa nas bordas (Gaussiana invertida, máx 5 km).
+    """
+    cx, cy = CENTRO_BACIA
+    dist_sq = (lon - cx)**2 + (lat - cy)**2
+    return -5000 * np.exp(-dist_sq / 0.5)
+
+def criar_piramide_embasamento(resolucao=1024):
+    """
+    Modela a superfície (suave) do embasamento em uma grade fina e a guarda como
+    pirâmide de médias (float32), da qual o renderizador escolhe só o nível necessário.
+    O relevo randômico é aplicado no nível renderizado: somado aqui, seria
+    atenuado pela média dos blocos.
+    """
+    from visualizacao.agregados import PiramideAgregada
+
+    lon_min, lat_min, lon_max, lat_max = LIMITES_BACIA
+    lons = lon_min + (np.arange(resolucao) + 0.5) * (lon_max - lon_min) / resolucao
+    lats = lat_min + (np.arange(resolucao) + 0.5) * (lat_max - lat_min) / resolucao
+    X, Y = np.meshgrid(lons, lats)
+    Z = profundidade_embasamento(X, Y)
+    return PiramideAgregada.de_grade(Z, LIMITES_BACIA, agregacao='media')
+
+def gerar_visualizacao_3d_maracaibo(gdf_campos=None, output_path=None, superficie=None, max_lado=128,
+                                    relevo_m=100.0):
     """
     Gera uma visualização 3D topográfica/batimétrica simulada da Bacia de Maracaibo.
     Salva como arquivo HTML.
+    gdf_campos: campos já carregados (opcional); se None, são recriados aqui.
+    superficie: pirâmide pré-calculada do embasamento (opcional); apenas o nível
+                com no máximo max_lado células por lado é embutido no HTML.
+    relevo_m: desvio padrão (m) do relevo randômico somado às células renderizadas.
     """
+    # plotly só é carregado quando a visualização é de fato gerada
+    import plotly.graph_objects as go
+
     print("Gerando visualização 3D da Bacia de Maracaibo...")
     
     # 1. Obter dados vetoriais da bacia
-    gdf_bacia, gdf_campos = criar_bacia_maracaibo_detalhada()
-    
-    # 2. Criar Grade (Grid) para Superfície 3D
-    # Intervalo de coordenadas da bacia (simplificado)
-    x_range = np.linspace(-73.0, -70.0, 100) # Longitude
-    y_range = np.linspace(9.0, 12.0, 100)    # Latitude
-    X, Y = np.meshgrid(x_range, y_range)
-
-    # 3. Modelar Profundidade (Simulação)
-    # A bacia é mais profunda no centro e rasa nas bordas
-    # Z representa a profundidade do embasamento (negativo)
-    cx, cy = -71.5, 10.5 # Centro aproximado
-    dist_sq = (X - cx)**2 + (Y - cy)**2
-    # Modelo Gaussiano invertido para simular a bacia
-    Z = -5000 * np.exp(-dist_sq / 0.5)  # Profundidade em metros (máx 5km)
+    if gdf_campos is None:
+        from geografia.camadas_geo import criar_bacia_maracaibo_detalhada
+        gdf_bacia, gdf_campos = criar_bacia_maracaibo_detalhada()
     
-    # Adicionar relevo randômico para realismo
-    Z += np.random.normal(0, 100, Z.shape)
+    # 2. e 3. Grade e Profundidade (Simulação)
+    # A resolução embutida é limitada por max_lado, independentemente da grade de origem
+    if superficie is None:
+        superficie = criar_piramide_embasamento(resolucao=max_lado)
+    nivel = superficie.nivel_por_lado(max_lado)
+    Z = superficie.nivel(nivel)
+    # Adicionar relevo randômico para realismo (na resolução exibida)
+    Z = (Z + np.random.normal(0, relevo_m, Z.shape)).astype(np.float32)
+    y_range, x_range = superficie.centros_celulas(nivel)  # Latitude, Longitude
 
     # 4. Plotar Superfície da Bacia
+    # Eixos 1D e Z em float32: o plotly serializa como array binário compacto
     bs_surface = go.Surface(
-        z=Z, x=X, y=Y,
+        z=Z, x=x_range.astype(np.float32), y=y_range.astype(np.float32),
         colorscale='Viridis',
         name='Embasamento Sedimentar',
         opacity=0.9
@@ -60,8 +89,7 @@ def gerar_visualizacao_3d_maracaibo():
         # Encontrar profundidade aproximada nesse ponto (interpolação simples)
         # Para visualização, vamos colocá-los "no topo" ou em uma camada de reservatório
         # Z_reservatorio ~ Z * 0.8
-        dist_pt = (cx_pt - cx)**2 + (cy_pt - cy)**2
-        z_pt = -5000 * np.exp(-dist_pt / 0.5) * 0.8
+        z_pt = profundidade_embasamento(cx_pt, cy_pt) * 0.8
         
         campos_x.append(cx_pt)
         campos_y.append(cy_pt)
@@ -101,9 +129,11 @@ def gerar_visualizacao_3d_maracaibo():
 
     fig = go.Figure(data=[bs_surface, campos_scatter], layout=layout)
     
-    output_path = os.path.join(os.path.dirname(__file__), 'bacia_maracaibo_3d.html')
+    if output_path is None:
+        output_path = os.path.join(os.path.dirname(__file__), 'bacia_maracaibo_3d.html')
     fig.write_html(output_path)
     print(f"Visualização 3D salva em: {output_path}")
+    return output_path
 
 if __name__ == "__main__":
     gerar_visualizacao_3d_maracaibo()